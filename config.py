@@ -48,6 +48,15 @@ SETTINGS = {
     # Web scraping settings
     "use_web_scraping": True,            # Whether to try web scraping first
     "scraping_timeout": 10,              # Timeout for web scraping requests in seconds
+    "scraping_concurrency": 8,           # Maximum newsletter web versions scraped at the same time
+    "scraping_cache_hours": 24,          # How long fetched pages stay cached on disk (0 disables the cache)
+    
+    # Notion settings
+    "notion_concurrency": 3,             # Maximum concurrent page creations (overridable by NOTION_CONCURRENCY)
+    "notion_requests_per_second": 3,     # Average request rate allowed by Notion (overridable by NOTION_REQUESTS_PER_SECOND)
+    "notion_retry_attempts": 7,          # Retries for rate-limited or unavailable Notion API calls
+    "notion_retry_delay": 0.5,           # Initial backoff in seconds, doubled on each retry
+    "notion_schema_cache_minutes": 60,   # How long the cached database schema stays valid (bypass with NOTION_SCHEMA_REFRESH)
     
     # LLM settings (can be overridden by environment variables)
     "llm_enabled": False,                # Whether to use LLM for categorization and summaries (overridable by USE_LLM_CATEGORIZATION)
@@ -2,8 +2,8 @@
 Data storage module for handling persistent data.
 """
 import os
-import json
 import logging
+import orjson
 from typing import Set
 
 logger = logging.getLogger("gmail_notion_manager.storage")
@@ -19,8 +19,8 @@ class DataStorage:
         """Load previously processed email IDs from persistent storage."""
         try:
             if os.path.exists(self.filename):
-                with open(self.filename, 'r') as f:
-                    return set(json.load(f))
+                with open(self.filename, 'rb') as f:
+                    return set(orjson.loads(f.read()))
             return set()
         except Exception as e:
             logger.error(f"Error loading processed IDs: {str(e)}")
@@ -31,8 +31,8 @@ class DataStorage:
         try:
             # Keep only the last 1000 processed IDs to avoid file growth
             ids_to_save = list(processed_ids)[-max_items:] if len(processed_ids) > max_items else list(processed_ids)
-            with open(self.filename, 'w') as f:
-                json.dump(ids_to_save, f)
+            with open(self.filename, 'wb') as f:
+                f.write(orjson.dumps(ids_to_save))
             logger.debug(f"Saved {len(ids_to_save)} processed IDs to {self.filename}")
         except Exception as e:
             logger.error(f"Error saving processed IDs: {str(e)}")
@@ -16,6 +16,7 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 import config
+from src.utils import format_timestamp
 
 logger = logging.getLogger("gmail_notion_manager.gmail")
 
@@ -231,7 +232,7 @@ class GmailService:
                 'body': plain_body,
                 'html': html_body,
                 'links': links,
-                'date': datetime.fromtimestamp(int(message['internalDate'])/1000).isoformat()
+                'date': format_timestamp(int(message['internalDate']))
             }
             
         except HttpError as error:
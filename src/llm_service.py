@@ -4,7 +4,7 @@ LLM Service for categorizing newsletter content.
 import os
 import logging
 from typing import Dict, Tuple, List, Optional
-import json
+import orjson
 import time
 from datetime import datetime, timedelta
 import openai
@@ -378,5 +378,6 @@ Summary (maximum {max_words} words):"""
             "model": self.model
         }
         
-        # Log as JSON for potential parsing by analysis tools
-        logger.debug(f"LLM decision details: {json.dumps(decision_log)}") 
\ No newline at end of file
+        # Log as JSON for potential parsing by analysis tools, only serializing when it will be logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"LLM decision details: {orjson.dumps(decision_log).decode()}") 
\ No newline at end of file
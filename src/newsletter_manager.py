@@ -6,6 +6,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Set, Dict, List, Optional, Tuple, Any
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import config
 from src.gmail_service import GmailService
@@ -74,15 +75,40 @@ class NewsletterManager:
             self.web_scraped_count = 0
             self.fallback_count = 0
             
+            # Fetch every email first so their web versions can be scraped concurrently
+            emails = []
             for message in messages:
                 try:
-                    self._process_single_email(message)
+                    email_data = self._fetch_email(message)
+                    if email_data:
+                        emails.append(email_data)
                 except Exception as e:
                     logger.error(f"Error processing message {message.get('id', 'unknown')}: {type(e).__name__} - {str(e)}")
                     continue
             
-            # Update the last check time
+            web_contents = self._scrape_web_versions(emails)
+            
+            # Prepare every email before creating the Notion entries concurrently,
+            # keeping the dates of the ones that fail so they can be tried again
+            pending_entries = []
+            failed_dates = []
+            for email_data, web_content in zip(emails, web_contents):
+                try:
+                    pending_entries.append(self._prepare_entry(email_data, web_content))
+                except Exception as e:
+                    logger.error(f"Error processing message {email_data['message_id']}: {type(e).__name__} - {str(e)}")
+                    failed_dates.append(email_data['date'])
+                    continue
+            
+            if pending_entries:
+                failed_dates.extend(self._create_notion_entries(pending_entries))
+            
+            # Update the last check time, but not past any email that failed so the next query returns it again
             self.last_check_time = datetime.now()
+            if failed_dates:
+                earliest_failed = min(datetime.fromisoformat(date) for date in failed_dates)
+                self.last_check_time = min(self.last_check_time, earliest_failed - timedelta(seconds=1))
+                logger.info(f"{len(failed_dates)} emails failed, next check starts from {self.last_check_time.isoformat()}")
             
             # Save processed IDs to persistent storage
             if self.processed_count > 0:
@@ -93,28 +119,60 @@ class NewsletterManager:
         except Exception as e:
             logger.error(f"Error in email processing workflow: {type(e).__name__} - {str(e)}")
     
-    def _process_single_email(self, message: Dict[str, Any]) -> None:
+    def _fetch_email(self, message: Dict[str, Any]) -> Optional[Dict]:
         """
-        Process a single email message.
+        Fetch the content of a single email message.
         
         Args:
             message: The email message data from Gmail API
+            
+        Returns:
+            Dictionary containing email content or None if already processed
         """
         # Skip if already processed
         if message['id'] in self.processed_ids:
             logger.debug(f"Skipping already processed message: {message['id']}")
-            return
+            return None
             
         logger.info(f"Processing message ID: {message['id']}")
         email_data = self.gmail.get_email_content(message['id'])
         email_data['message_id'] = message['id']
+        return email_data
+    
+    def _scrape_web_versions(self, emails: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Scrape the web versions of the emails concurrently.
         
-        # Try to use web scraping first
-        web_content = self._try_web_scraping(email_data)
+        Args:
+            emails: List of dictionaries returned by _fetch_email
+            
+        Returns:
+            List with the _try_web_scraping result for each email, in the same order
+        """
+        if not emails:
+            return []
+        
+        # Scraping is network-bound, so overlap the page fetches in a thread pool
+        max_workers = min(config.SETTINGS["scraping_concurrency"], len(emails))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._try_web_scraping, emails))
+    
+    def _prepare_entry(self, email_data: Dict, web_content: Optional[Dict]) -> Dict:
+        """
+        Categorize a single email using its scraped web version when available.
+        
+        Args:
+            email_data: Dictionary returned by _fetch_email
+            web_content: Result of _try_web_scraping for the email
+            
+        Returns:
+            Dictionary with the NotionService.create_entry arguments
+        """
+        message_id = email_data['message_id']
         
         if web_content:
             # Use web-scraped content for Notion
-            logger.info(f"Using web-scraped content for message: {message['id']}")
+            logger.info(f"Using web-scraped content for message: {message_id}")
             self.web_scraped_count += 1
             
             # Update email data with improved content
@@ -130,7 +188,7 @@ class NewsletterManager:
             )
         else:
             # Use original email content as fallback
-            logger.info(f"Using original email content for message: {message['id']}")
+            logger.info(f"Using original email content for message: {message_id}")
             self.fallback_count += 1
             
             # Categorize the email content
@@ -168,16 +226,47 @@ class NewsletterManager:
                 logger.error(f"Error generating summary: {type(e).__name__} - {str(e)}")
                 email_data['summary'] = None
         
-        # Create Notion entry
-        self.notion.create_entry(email_data, category, confidence, all_scores)
+        return {
+            'email_data': email_data,
+            'category': category,
+            'confidence': confidence,
+            'all_scores': all_scores
+        }
+    
+    def _create_notion_entries(self, entries: List[Dict]) -> List[str]:
+        """
+        Create the Notion entries for the prepared emails concurrently.
         
-        # Mark as processed
-        self.processed_ids.add(message['id'])
-        self.processed_count += 1
+        Args:
+            entries: List of dictionaries returned by _prepare_entry
+            
+        Returns:
+            List with the date of each email whose entry couldn't be created
+        """
+        results = self.notion.run(self.notion.create_entries(entries))
+        failed_dates = []
+        
+        for entry, result in zip(entries, results):
+            message_id = entry['email_data']['message_id']
+            if isinstance(result, Exception):
+                logger.error(f"Error creating Notion entry for message {message_id}: {type(result).__name__} - {str(result)}")
+                failed_dates.append(entry['email_data']['date'])
+                continue
+            if result is None:
+                # create_entry has already logged why the entry couldn't be created
+                logger.warning(f"Notion entry for message {message_id} was not created, leaving it unprocessed")
+                failed_dates.append(entry['email_data']['date'])
+                continue
+
+            # Mark as processed
+            self.processed_ids.add(message_id)
+            self.processed_count += 1
+            
+            # Save processed IDs periodically
+            if self.processed_count % config.SETTINGS["batch_save_count"] == 0:
+                self.storage.save_processed_ids(self.processed_ids)
         
-        # Save processed IDs periodically
-        if self.processed_count % config.SETTINGS["batch_save_count"] == 0:
-            self.storage.save_processed_ids(self.processed_ids)
+        return failed_dates
     
     def _try_web_scraping(self, email_data: Dict) -> Optional[Dict]:
         """
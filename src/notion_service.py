@@ -2,10 +2,17 @@
 Notion service module for handling Notion API interactions.
 """
 import os
+import asyncio
+import json
 import logging
-from typing import Dict, List
-from notion_client import Client
-from notion_client.errors import APIResponseError
+import random
+import time
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional
+import httpx
+import orjson
+from notion_client import AsyncClient
+from notion_client.errors import APIErrorCode, APIResponseError, HTTPResponseError, RequestTimeoutError
 from datetime import datetime
 import re
 
@@ -13,538 +20,654 @@ import config
 
 logger = logging.getLogger("gmail_notion_manager.notion")
 
+# Characters that mark a line as a bullet point
+BULLET_PREFIXES = ('•', '*', '-')
+
+# File used to cache the database schema between runs
+SCHEMA_CACHE_FILE = "notion_schema.json"
+
+# Characters of the body cleaned up for the Description preview before falling back to the whole body
+PREVIEW_SOURCE_LENGTH = 4000
+
+# Maximum number of blocks Notion accepts in a single request
+MAX_BLOCKS_PER_REQUEST = 100
+
+# Maximum characters per rich text item, kept safely under Notion's 2000 character limit
+MAX_TEXT_LENGTH = 1900
+
+# Notion errors that are worth retrying after a short wait
+RETRYABLE_ERROR_CODES = (APIErrorCode.RateLimited, APIErrorCode.ConflictError)
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+
+# Gateway and availability errors after which Notion may still have processed the request
+AMBIGUOUS_STATUS_CODES = (502, 503, 504)
+
+# Precompiled patterns for cleaning the description and parsing content into blocks
+WHITESPACE_PATTERN = re.compile(r'\s{2,}|[\n\r\t]')
+FORMATTING_MARKS_PATTERN = re.compile(r'[*#\-_]+')
+TITLE_DESCRIPTION_PATTERN = re.compile(r'\*\*(.+?)\*\*\s*\n+(.+)', re.DOTALL)
+PARAGRAPH_SPLIT_PATTERN = re.compile(r'\n\s*\n')
+HEADING_PATTERN = re.compile(r'^(#+)\s+')
+BULLET_SPLIT_PATTERN = re.compile(r'\n\s*[•*-]\s*')
+
+def _text(content: str, bold: bool = False, color: Optional[str] = None, link: Optional[str] = None) -> Dict:
+    """Create a rich text item with optional bold, color and link."""
+    if link:
+        item = {"type": "text", "text": {"content": content, "link": {"url": link}}}
+    else:
+        item = {"type": "text", "text": {"content": content}}
+    
+    # Most content chunks are plain text, so only allocate annotations when needed
+    if bold and color:
+        item["annotations"] = {"bold": True, "color": color}
+    elif bold:
+        item["annotations"] = {"bold": True}
+    elif color:
+        item["annotations"] = {"color": color}
+    return item
+
+def _paragraph(*rich_text: Dict) -> Dict:
+    """Create a paragraph block from rich text items."""
+    return {"object": "block", "type": "paragraph", "paragraph": {"rich_text": list(rich_text)}}
+
+def _heading(level: int, *rich_text: Dict, color: Optional[str] = None) -> Dict:
+    """Create a heading block of the given level (1-3) from rich text items."""
+    heading_type = f"heading_{level}"
+    heading = {"rich_text": list(rich_text)}
+    if color:
+        heading["color"] = color
+    return {"object": "block", "type": heading_type, heading_type: heading}
+
+def _bullet(*rich_text: Dict) -> Dict:
+    """Create a bulleted list item block from rich text items."""
+    return {"object": "block", "type": "bulleted_list_item", "bulleted_list_item": {"rich_text": list(rich_text)}}
+
+def _divider() -> Dict:
+    """Create a divider block."""
+    return {"object": "block", "type": "divider", "divider": {}}
+
+class AmbiguousRequestError(Exception):
+    """A write request failed without telling whether Notion applied it, so it can't safely be sent again."""
+
+class OrjsonAsyncClient(AsyncClient):
+    """Async Notion client that serializes requests and parses responses with orjson instead of the stdlib json module."""
+    
+    def _build_request(
+        self,
+        method: str,
+        path: str,
+        query: Optional[Dict[Any, Any]] = None,
+        body: Optional[Dict[Any, Any]] = None,
+        auth: Optional[str] = None,
+    ) -> httpx.Request:
+        """Build the request with a pre-serialized JSON body."""
+        if body is None:
+            return super()._build_request(method, path, query, body, auth)
+        
+        headers = httpx.Headers({"Content-Type": "application/json"})
+        if auth:
+            headers["Authorization"] = f"Bearer {auth}"
+        # Keep the base client's request logging, only formatting the body when it will be logged
+        self.logger.info(f"{method} {self.client.base_url}{path}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"=> {query} -- {body}")
+        return self.client.build_request(
+            method, path, params=query, content=orjson.dumps(body), headers=headers
+        )
+    
+    def _parse_response(self, response: httpx.Response) -> Any:
+        """Parse successful responses with orjson, leaving error responses to the base client."""
+        if response.is_error:
+            return super()._parse_response(response)
+        
+        body = orjson.loads(response.content)
+        self.logger.debug("=> %s", body)
+        return body
+
 class NotionService:
     """Handles all Notion API operations."""
     
     def __init__(self):
         """Initialize the Notion service."""
-        self.client = Client(auth=os.getenv("NOTION_TOKEN"))
         self.database_id = os.getenv("NOTION_DATABASE_ID")
+        
+        # Maximum number of concurrent page creations (Notion averages ~3 requests per second)
+        self.max_concurrency = int(os.getenv("NOTION_CONCURRENCY", config.SETTINGS["notion_concurrency"]))
+        self._semaphore = None
+        
+        # Space out request starts so bursts of concurrent calls stay under Notion's rate limit
+        self.requests_per_second = float(os.getenv("NOTION_REQUESTS_PER_SECOND", config.SETTINGS["notion_requests_per_second"]))
+        if self.requests_per_second <= 0:
+            raise ValueError(f"NOTION_REQUESTS_PER_SECOND must be greater than 0, got {self.requests_per_second}")
+        self._rate_lock = None
+        self._next_request_time = 0.0
+        
+        # Keep one connection alive per concurrent request so every call after the first
+        # reuses an open connection instead of paying for a new TLS handshake, and let
+        # HTTP/2 multiplex the concurrent requests over them
+        http_client = httpx.AsyncClient(http2=True, limits=httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        ))
+        self.client = OrjsonAsyncClient(auth=os.getenv("NOTION_TOKEN"), client=http_client)
+        
+        # Retry configuration for rate limits and transient errors
+        self.max_retries = config.SETTINGS["notion_retry_attempts"]
+        self.retry_delay = config.SETTINGS["notion_retry_delay"]  # seconds
+        
+        # The async client's connection pool is bound to the loop it runs on, so keep a single one
+        self._loop = asyncio.new_event_loop()
+        
         # Verify database properties on init
-        self.available_properties = self._get_database_properties()
+        self._set_available_properties(self.run(self._get_database_properties()))
+    
+    def _set_available_properties(self, properties: Dict) -> None:
+        """Store the database properties and the subset enabled in the configuration."""
+        self.available_properties = properties
+        # Properties that are both configured and present in the database, checked once per entry
+        self.enabled_properties = frozenset(config.NOTION_DATABASE_PROPERTIES) & properties.keys()
+    
+    def run(self, coroutine: Awaitable) -> Any:
+        """Run a coroutine to completion on the service's event loop."""
+        return self._loop.run_until_complete(coroutine)
+    
+    async def _call_with_retry(self, request: Callable[[], Awaitable]) -> Any:
+        """
+        Make a Notion API call, retrying rate limits and transient errors with exponential backoff.
+        
+        Args:
+            request: Function returning a new awaitable for the API call on each attempt
+            
+        Returns:
+            The API response
+        """
+        for attempt in range(self.max_retries + 1):
+            wait_time = (2 ** attempt) * self.retry_delay
+            try:
+                return await request()
+            except HTTPResponseError as e:
+                retryable = e.code in RETRYABLE_ERROR_CODES or e.status in RETRYABLE_STATUS_CODES
+                if not retryable or attempt == self.max_retries:
+                    raise
+                
+                # Honor the server's Retry-After header when present
+                try:
+                    wait_time = float(e.headers.get("Retry-After", wait_time))
+                except ValueError:
+                    pass
+                error = e.status
+            except httpx.ConnectError:
+                # The request never reached Notion, so sending it again can't create duplicates
+                if attempt == self.max_retries:
+                    raise
+                error = "connection failed"
+            except RequestTimeoutError as e:
+                # notion-client wraps every httpx timeout, but only a connect timeout
+                # means the request was never sent; other timeouts may have been applied
+                if not isinstance(e.__cause__ or e.__context__, httpx.ConnectTimeout) or attempt == self.max_retries:
+                    raise
+                error = "connection timed out"
+            
+            wait_time += random.uniform(0, 0.25)
+            logger.warning("Notion API error (%s), retrying in %.2fs (%d/%d)",
+                           error, wait_time, attempt + 1, self.max_retries)
+            await asyncio.sleep(wait_time)
+    
+    async def _get_database_properties(self) -> Dict:
+        """Get the properties available in the Notion database, using the cached schema when fresh."""
+        # Set NOTION_SCHEMA_REFRESH to bypass the cache
+        if not os.getenv("NOTION_SCHEMA_REFRESH"):
+            properties = self._load_cached_properties()
+            if properties is not None:
+                return properties
+        
+        properties = await self._fetch_database_properties()
+        return properties if properties is not None else {}
+    
+    async def _fetch_database_properties(self) -> Optional[Dict]:
+        """Retrieve the actual properties of the Notion database from the API and cache them, or None on failure."""
+        try:
+            database = await self._call_with_retry(
+                lambda: self.client.databases.retrieve(self.database_id)
+            )
+        except Exception as e:
+            logger.error("Error retrieving database properties: %s", e)
+            return None
+        
+        properties = database.get("properties", {})
+        self._save_cached_properties(properties)
+        return properties
+    
+    async def _refresh_database_properties(self) -> bool:
+        """Reload the database properties from the API, bypassing the cache, and report whether they changed."""
+        logger.info("Refreshing Notion database properties")
+        properties = await self._fetch_database_properties()
+        # Keep the current schema when the fetch fails rather than dropping every property
+        if properties is None or properties == self.available_properties:
+            return False
+        self._set_available_properties(properties)
+        return True
+    
+    def _load_cached_properties(self) -> Optional[Dict]:
+        """Load the database properties from the schema cache if it is fresh and for this database."""
+        try:
+            if not os.path.exists(SCHEMA_CACHE_FILE):
+                return None
+            with open(SCHEMA_CACHE_FILE, 'r') as f:
+                cache = json.load(f)
+            
+            max_age = config.SETTINGS["notion_schema_cache_minutes"] * 60
+            if cache.get("database_id") != self.database_id or time.time() - cache.get("fetched_at", 0) > max_age:
+                return None
+            
+            logger.debug("Using cached Notion database properties from %s", SCHEMA_CACHE_FILE)
+            return cache.get("properties", {})
+        except Exception as e:
+            logger.warning("Error loading cached database properties: %s", e)
+            return None
+    
+    def _save_cached_properties(self, properties: Dict) -> None:
+        """Save the database properties to the schema cache."""
+        try:
+            with open(SCHEMA_CACHE_FILE, 'w') as f:
+                json.dump({
+                    "database_id": self.database_id,
+                    "fetched_at": time.time(),
+                    "properties": properties
+                }, f)
+        except Exception as e:
+            logger.warning("Error saving database properties cache: %s", e)
+    
+    async def _wait_for_rate_limit(self) -> None:
+        """Wait until the next request can start without exceeding the configured request rate."""
+        # Created lazily so the lock belongs to the running event loop
+        if self._rate_lock is None:
+            self._rate_lock = asyncio.Lock()
+        
+        async with self._rate_lock:
+            now = time.monotonic()
+            wait_time = self._next_request_time - now
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            self._next_request_time = max(now, self._next_request_time) + 1 / self.requests_per_second
+    
+    async def _request(self, request: Callable[[], Awaitable]) -> Any:
+        """Make a Notion API call with retries, limiting the number and rate of requests in flight."""
+        # Created lazily so the semaphore belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async with self._semaphore:
+            return await self._call_with_retry(self._rate_limited(request))
+    
+    def _rate_limited(self, request: Callable[[], Awaitable]) -> Callable[[], Awaitable]:
+        """Wrap an API call so each attempt, including retries, waits for the rate limit first."""
+        async def call():
+            await self._wait_for_rate_limit()
+            return await request()
+        return call
+    
+    async def _create_page(self, properties: Dict, children: List[Dict]) -> Dict:
+        """Create a page in the database, without creating a duplicate when a failed attempt actually succeeded."""
+        async def create():
+            try:
+                return await self.client.pages.create(
+                    parent={"database_id": self.database_id},
+                    properties=properties,
+                    children=children
+                )
+            except HTTPResponseError as e:
+                # The page may exist even though the response was lost, so look for it before retrying
+                if e.status in AMBIGUOUS_STATUS_CODES:
+                    existing_page = await self._find_created_page(properties, e)
+                    if existing_page:
+                        logger.info("Notion page was created despite a %s error, not creating it again", e.status)
+                        return existing_page
+                raise
+        
+        return await self._request(create)
+    
+    async def _find_created_page(self, properties: Dict, error: HTTPResponseError) -> Optional[Dict]:
+        """
+        Find the page a failed create may have made, matching its title, source and date.
+        Raises AmbiguousRequestError when that can't be determined, so the create isn't sent again.
+        """
+        source_url = properties.get("Source", {}).get("url")
+        if "Name" not in properties or not source_url:
+            # Only the source link identifies the email, a matching title could belong to another page
+            raise AmbiguousRequestError(
+                f"Notion returned {error.status} for a page that can't be looked up by its source link"
+            ) from error
+        
+        filters = [
+            {"property": "Name", "title": {"equals": properties["Name"]["title"][0]["text"]["content"]}},
+            {"property": "Source", "url": {"equals": source_url}}
+        ]
+        if "Date" in properties:
+            filters.append({"property": "Date", "date": {"equals": properties["Date"]["date"]["start"]}})
+        
+        try:
+            await self._wait_for_rate_limit()
+            response = await self.client.databases.query(
+                database_id=self.database_id,
+                filter={"and": filters},
+                page_size=1
+            )
+        except Exception as e:
+            raise AmbiguousRequestError(
+                f"Notion returned {error.status} and checking for the created page failed: {e}"
+            ) from e
+        
+        results = response.get("results", [])
+        return results[0] if results else None
+    
+    async def _append_blocks(self, block_id: str, blocks: Iterable[Dict], block_count: int,
+                             plain_text_fallback: bool = True) -> int:
+        """
+        Append blocks to a page, consuming them in chunks of at most MAX_BLOCKS_PER_REQUEST.
+        
+        Args:
+            block_id: ID of the page to append to
+            blocks: Blocks to append
+            block_count: Number of blocks the page already has
+            plain_text_fallback: Whether to resend a chunk Notion rejects as plain paragraphs
+            
+        Returns:
+            The number of blocks the page has afterwards
+        """
+        blocks = iter(blocks)
+        chunk = list(islice(blocks, MAX_BLOCKS_PER_REQUEST))
+        while chunk:
+            try:
+                await self._append_chunk(block_id, chunk, block_count)
+                block_count += len(chunk)
+            except APIResponseError as e:
+                # Keep the text of a rejected chunk by sending it without formatting or links
+                if e.code != APIErrorCode.ValidationError or not plain_text_fallback:
+                    raise
+                logger.warning("Notion rejected a chunk of blocks, appending it as plain paragraphs: %s", e)
+                block_count = await self._append_blocks(
+                    block_id, self._plain_paragraphs(chunk), block_count, plain_text_fallback=False
+                )
+            chunk = list(islice(blocks, MAX_BLOCKS_PER_REQUEST))
+        return block_count
+    
+    async def _append_chunk(self, block_id: str, chunk: List[Dict], block_count: int) -> None:
+        """Append one chunk of blocks, without writing it twice when a failed attempt actually succeeded."""
+        async def append():
+            try:
+                return await self.client.blocks.children.append(block_id=block_id, children=chunk)
+            except HTTPResponseError as e:
+                # Appends aren't idempotent, so count the page's blocks to see whether this one went through
+                if e.status in AMBIGUOUS_STATUS_CODES:
+                    current_count = await self._count_child_blocks(block_id, e)
+                    if current_count == block_count + len(chunk):
+                        logger.info("Notion blocks were appended despite a %s error, not appending them again", e.status)
+                        return None
+                    if current_count != block_count:
+                        raise AmbiguousRequestError(
+                            f"Notion returned {e.status} and the page has {current_count} blocks, "
+                            f"expected {block_count} or {block_count + len(chunk)}"
+                        ) from e
+                raise
+        
+        await self._request(append)
     
-    def _get_database_properties(self) -> Dict:
-        """Get the actual properties available in the Notion database."""
+    async def _count_child_blocks(self, block_id: str, error: HTTPResponseError) -> int:
+        """Count the blocks of a page, raising AmbiguousRequestError if they can't be listed."""
+        count = 0
+        params = {"page_size": MAX_BLOCKS_PER_REQUEST}
         try:
-            database = self.client.databases.retrieve(self.database_id)
-            return database.get("properties", {})
+            while True:
+                await self._wait_for_rate_limit()
+                response = await self.client.blocks.children.list(block_id=block_id, **params)
+                count += len(response.get("results", []))
+                if not response.get("has_more"):
+                    return count
+                params["start_cursor"] = response["next_cursor"]
         except Exception as e:
-            logger.error(f"Error retrieving database properties: {str(e)}")
-            return {}
+            raise AmbiguousRequestError(
+                f"Notion returned {error.status} and listing the page's blocks failed: {e}"
+            ) from e
     
-    def create_entry(self, email_data: Dict, category: str, confidence: float, all_scores: Dict[str, float]):
-        """Create a new entry in Notion database."""
+    async def _archive_page(self, page_id: str) -> None:
+        """Archive a page whose content couldn't be written, so a later retry doesn't leave a partial duplicate."""
         try:
+            await self._request(lambda: self.client.pages.update(page_id=page_id, archived=True))
+        except Exception as e:
+            logger.error("Error archiving incomplete Notion page %s, it needs to be removed manually: %s", page_id, e)
+    
+    async def create_entries(self, entries: List[Dict]) -> List:
+        """
+        Create several Notion entries concurrently.
+        
+        Args:
+            entries: List of dictionaries with the create_entry keyword arguments
+            
+        Returns:
+            A list with the result of each entry (None if it couldn't be created), or the exception it raised
+        """
+        return await asyncio.gather(
+            *(self.create_entry(**entry) for entry in entries),
+            return_exceptions=True
+        )
+    
+    async def create_entry(self, email_data: Dict, category: str, confidence: float, all_scores: Dict[str, float],
+                           retry_on_schema_change: bool = True):
+        """
+        Create a new entry in Notion database, returning the page or None if it couldn't be created.
+        
+        When Notion rejects the page and the refreshed database schema differs from the one used,
+        the entry is built and sent again once before falling back to a basic entry.
+        """
+        try:
+            # Unpack the email fields used throughout this method
+            subject = email_data['subject']
+            body = email_data['body']
+            links = email_data['links']
+            sender = email_data['sender']
+            date = email_data['date']
+            source_url = email_data.get('source_url')
+            was_scraped = email_data.get('was_scraped')
+            
             # Prepare source links
             email_link = f"https://mail.google.com/mail/u/0/#inbox/{email_data['message_id']}"
             
             # Extract explanation if available
-            explanation = all_scores.pop("__explanation__", None) if all_scores else None
+            # Work on a copy so the caller's scores still carry the explanation if the entry is retried
+            scores = dict(all_scores or {})
+            explanation = scores.pop("__explanation__", None)
+            cat_method = "LLM" if explanation and "Matched keywords" not in str(explanation) else "Keywords"
             
-            # Format other category scores for reference
-            other_categories = ", ".join([f"{cat}: {score:.2f}" for cat, score in all_scores.items() if cat != category and score > 0])
+            # Resolve the labels that depend on whether the content was web scraped
+            if was_scraped:
+                source_type, source_label, source_color = "Web Scraped", "Web Scraped", "green"
+            else:
+                source_type, source_label, source_color = "Email", "Email Content", "gray"
+            
+            # Format the sender and date once for the page header
+            sender_name = sender.split('<', 1)[0].strip()
+            email_date = datetime.fromisoformat(date).strftime("%B %d, %Y")
             
             # Extract first link from email if available
-            content_link = email_data['links'][0] if email_data['links'] else ""
+            content_link = links[0] if links else ""
             
             # Prepare properties based on configuration
             properties = {}
+            enabled_properties = self.enabled_properties
             
             # Set "Name" property using title type (according to config.py)
             if "Name" in self.available_properties:
-                properties["Name"] = {"title": [{"text": {"content": email_data['subject']}}]}
+                properties["Name"] = {"title": [{"text": {"content": subject}}]}
             
             # Add other properties from config, but only if they exist in the database
-            if "Category" in config.NOTION_DATABASE_PROPERTIES and "Category" in self.available_properties:
+            if "Category" in enabled_properties:
                 properties["Category"] = {"select": {"name": category}}
             
             # Prioritize the web URL as the primary Source if available
-            if "Source" in config.NOTION_DATABASE_PROPERTIES and "Source" in self.available_properties:
+            if "Source" in enabled_properties:
                 # Use the web URL as primary source if available, otherwise use email link
-                if email_data.get('source_url'):
-                    properties["Source"] = {"url": email_data['source_url']}
-                    logger.debug(f"Using source URL as primary source: {email_data['source_url']}")
+                if source_url:
+                    properties["Source"] = {"url": source_url}
+                    logger.debug("Using source URL as primary source: %s", source_url)
                 else:
                     properties["Source"] = {"url": email_link}
-                    logger.debug(f"Using email link as primary source: {email_link}")
+                    logger.debug("Using email link as primary source: %s", email_link)
                 
-            if "Date" in config.NOTION_DATABASE_PROPERTIES and "Date" in self.available_properties:
-                properties["Date"] = {"date": {"start": email_data['date']}}
+            if "Date" in enabled_properties:
+                properties["Date"] = {"date": {"start": date}}
             
             # Add the email URL as secondary source if we used web scraping
-            if "Web Source" in config.NOTION_DATABASE_PROPERTIES and "Web Source" in self.available_properties:
-                if email_data.get('was_scraped') or email_data.get('source_url'):
+            if "Web Source" in enabled_properties:
+                if was_scraped or source_url:
                     # If we used web scraping or have a source URL, use email link as secondary source
                     properties["Web Source"] = {"url": email_link}
-                    logger.debug(f"Setting Web Source to email link: {email_link}")
+                    logger.debug("Setting Web Source to email link: %s", email_link)
                 else:
                     # Otherwise leave it unset or set to None
                     properties["Web Source"] = {"url": None}
             
             # We'll move the full content to the page body, but still keep a short preview in the Description field
-            if "Description" in config.NOTION_DATABASE_PROPERTIES and "Description" in self.available_properties:
+            if "Description" in enabled_properties:
                 # Use LLM-generated summary if available, otherwise create a simple preview
                 if email_data.get('summary'):
                     # Use the LLM-generated summary
                     preview = email_data['summary']
-                    logger.debug(f"Using LLM-generated summary for description: {preview[:100]}...")
+                    logger.debug("Using LLM-generated summary for description: %.100s...", preview)
                 else:
-                    # Clean up the preview to remove any formatting characters or newlines
-                    cleaned_preview = re.sub(r'[\n\r\t]+', ' ', email_data['body'])
-                    cleaned_preview = re.sub(r'\s{2,}', ' ', cleaned_preview)
-                    cleaned_preview = re.sub(r'[*#\-_]+', '', cleaned_preview)
-                    # Ensure preview is under 2000 chars (Notion limit)
-                    preview = cleaned_preview[:1900] + "..." if len(cleaned_preview) > 1900 else cleaned_preview
-                    logger.debug(f"Using auto-generated preview for description: {preview[:100]}...")
+                    # Clean up the preview to remove any formatting characters or newlines.
+                    # Cleaning only shortens text, so a prefix of the body is normally enough
+                    # to fill the preview; clean the whole body only when it is not.
+                    cleaned_preview = self._clean_preview(body[:PREVIEW_SOURCE_LENGTH])
+                    if len(cleaned_preview.rstrip()) <= MAX_TEXT_LENGTH and len(body) > PREVIEW_SOURCE_LENGTH:
+                        cleaned_preview = self._clean_preview(body)
+                    # Ensure preview is under Notion's 2000 character limit
+                    preview = cleaned_preview[:MAX_TEXT_LENGTH] + "..." if cleaned_preview[MAX_TEXT_LENGTH:MAX_TEXT_LENGTH + 1] else cleaned_preview
+                    logger.debug("Using auto-generated preview for description: %.100s...", preview)
                 
                 properties["Description"] = {"rich_text": [{"text": {"content": preview}}]}
                 
             # Add optional properties if configured AND if they exist in the database
-            if "Content Link" in config.NOTION_DATABASE_PROPERTIES and "Content Link" in self.available_properties:
+            if "Content Link" in enabled_properties:
                 properties["Content Link"] = {"url": content_link} if content_link else {"url": None}
                 
-            if "Confidence" in config.NOTION_DATABASE_PROPERTIES and "Confidence" in self.available_properties:
+            if "Confidence" in enabled_properties:
                 properties["Confidence"] = {"number": confidence}
                 
-            if "Other Categories" in config.NOTION_DATABASE_PROPERTIES and "Other Categories" in self.available_properties:
-                other_cats_text = other_categories[:1900] if len(other_categories) > 1900 else other_categories
-                properties["Other Categories"] = {"rich_text": [{"text": {"content": other_cats_text}}]}
+            if "Other Categories" in enabled_properties:
+                # Format other category scores for reference
+                other_categories = ", ".join(f"{cat}: {score:.2f}" for cat, score in scores.items() if cat != category and score > 0)
+                properties["Other Categories"] = {"rich_text": [{"text": {"content": other_categories[:MAX_TEXT_LENGTH]}}]}
                 
-            if "Sender" in config.NOTION_DATABASE_PROPERTIES and "Sender" in self.available_properties:
-                sender_text = email_data['sender'][:1900] if len(email_data['sender']) > 1900 else email_data['sender']
+            if "Sender" in enabled_properties:
+                sender_text = sender[:MAX_TEXT_LENGTH]
                 properties["Sender"] = {"rich_text": [{"text": {"content": sender_text}}]}
                 
-            if "Source Type" in config.NOTION_DATABASE_PROPERTIES and "Source Type" in self.available_properties:
-                source_type = "Web Scraped" if email_data.get('was_scraped') else "Email"
+            if "Source Type" in enabled_properties:
                 properties["Source Type"] = {"select": {"name": source_type}}
                 
             # Add explicit Categorization Method if the property exists
-            if "Categorization Method" in config.NOTION_DATABASE_PROPERTIES and "Categorization Method" in self.available_properties:
-                cat_method = "LLM" if explanation and "Matched keywords" not in str(explanation) else "Keywords"
+            if "Categorization Method" in enabled_properties:
                 properties["Categorization Method"] = {"select": {"name": cat_method}}
             
-            # Prepare the page content blocks with enhanced formatting
-            children = []
-            
-            # Add a header with sender and date
-            sender_name = email_data['sender'].split('<')[0].strip()
-            email_date = datetime.fromisoformat(email_data['date']).strftime("%B %d, %Y")
-            
-            # Add a divider and metadata section at the top
-            children.extend([
-                {
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Newsletter Details"
-                                }
-                            }
-                        ],
-                        "color": "blue_background"
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "From: "
-                                },
-                                "annotations": {
-                                    "bold": True
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": sender_name
-                                }
-                            }
-                        ]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Date: "
-                                },
-                                "annotations": {
-                                    "bold": True
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": email_date
-                                }
-                            }
-                        ]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Category: "
-                                },
-                                "annotations": {
-                                    "bold": True
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": category
-                                },
-                                "annotations": {
-                                    "color": "blue"
-                                }
-                            }
-                        ]
-                    }
-                }
-            ])
+            # Prepare the page header blocks with enhanced formatting
+            children = [
+                _heading(2, _text("Newsletter Details"), color="blue_background"),
+                _paragraph(_text("From: ", bold=True), _text(sender_name)),
+                _paragraph(_text("Date: ", bold=True), _text(email_date)),
+                _paragraph(_text("Category: ", bold=True), _text(category, color="blue"))
+            ]
             
             # Add explanation if available
             if explanation:
-                children.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Categorization Reasoning: "
-                                },
-                                "annotations": {
-                                    "bold": True
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": explanation
-                                },
-                                "annotations": {
-                                    "color": "green" if "Matched keywords" not in explanation else "orange"
-                                }
-                            }
-                        ]
-                    }
-                })
+                explanation_color = "green" if "Matched keywords" not in explanation else "orange"
+                children.append(_paragraph(
+                    _text("Categorization Reasoning: ", bold=True),
+                    _text(explanation, color=explanation_color)
+                ))
                 
-            # Add categorization method
-            cat_method = "LLM" if explanation and "Matched keywords" not in str(explanation) else "Keywords"
-            children.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "Categorization Method: "
-                            },
-                            "annotations": {
-                                "bold": True
-                            }
-                        },
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": cat_method
-                            },
-                            "annotations": {
-                                "color": "purple"
-                            }
-                        }
-                    ]
-                }
-            })
-            
-            children.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "Source: "
-                            },
-                            "annotations": {
-                                "bold": True
-                            }
-                        },
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "Web Scraped" if email_data.get('was_scraped') else "Email Content"
-                            },
-                            "annotations": {
-                                "color": "green" if email_data.get('was_scraped') else "gray"
-                            }
-                        }
-                    ]
-                }
-            })
+            # Add categorization method and content source
+            children.append(_paragraph(_text("Categorization Method: ", bold=True), _text(cat_method, color="purple")))
+            children.append(_paragraph(_text("Source: ", bold=True), _text(source_label, color=source_color)))
             
             # Add source links
-            if email_data.get('source_url'):
-                # Add web version link
-                children.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Newsletter URL: "
-                                },
-                                "annotations": {
-                                    "bold": True
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Web Version",
-                                    "link": {"url": email_data['source_url']}
-                                },
-                                "annotations": {
-                                    "color": "blue"
-                                }
-                            }
-                        ]
-                    }
-                })
-                
-                # Add original email link
-                children.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Original Email: "
-                                },
-                                "annotations": {
-                                    "bold": True
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Gmail Link",
-                                    "link": {"url": email_link}
-                                }
-                            }
-                        ]
-                    }
-                })
-            
-            # Add separator
-            children.append({
-                "object": "block",
-                "type": "divider",
-                "divider": {}
-            })
-            
-            # Add content header
-            children.append({
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "Newsletter Content"
-                            }
-                        }
-                    ],
-                    "color": "blue_background"
-                }
-            })
-            
-            # Reserve slots for content (Notion has 100 block limit)
-            # Header section took up 7 blocks, leave some room for links section
-            max_content_blocks = 80
-            
-            # Initialize content section blocks
-            content_blocks = []
-            
-            # Determine how to process the content based on whether we have scraped sections
-            if email_data.get('sections'):
-                # Use the pre-scraped sections (from web scraping)
-                content_blocks = self._create_blocks_from_scraped_sections(email_data['sections'])
-            else:
-                # Process the content from email body (traditional method)
-                content_blocks = self._create_blocks_from_email_body(email_data['body'])
-            
-            # Limit content blocks to max allowed
-            if len(content_blocks) > max_content_blocks:
-                logger.warning(f"Content has {len(content_blocks)} blocks, limiting to {max_content_blocks}")
-                content_blocks = content_blocks[:max_content_blocks]
-                # Add a note about truncation
-                content_blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Note: Content was truncated due to Notion's block limit."
-                                },
-                                "annotations": {
-                                    "italic": True,
-                                    "color": "orange"
-                                }
-                            }
-                        ]
-                    }
-                })
-            
-            # Add all content blocks
-            children.extend(content_blocks)
-            
-            # If we have links and space for them, add them in a better formatted section
-            if email_data['links'] and (len(children) < 95):  # Leave some margin
-                # Add a divider before links section
-                children.extend([
-                    {
-                        "object": "block",
-                        "type": "divider",
-                        "divider": {}
-                    },
-                    {
-                        "object": "block",
-                        "type": "heading_3",
-                        "heading_3": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {
-                                        "content": "Links"
-                                    }
-                                }
-                            ]
-                        }
-                    }
-                ])
-                
-                # Add links as bullet points (up to the limit)
-                links_to_add = min(len(email_data['links']), 95 - len(children))
-                for i in range(links_to_add):
-                    link = email_data['links'][i]
-                    # Skip empty links
-                    if not link or link == "#" or link.startswith("javascript:"):
-                        continue
-                        
-                    # Create a bullet with the link
-                    children.append({
-                        "object": "block",
-                        "type": "bulleted_list_item",
-                        "bulleted_list_item": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {
-                                        "content": link,
-                                        "link": {"url": link}
-                                    }
-                                }
-                            ]
-                        }
-                    })
-                    
-                    # Break if we're getting too close to the limit
-                    if len(children) >= 98:
-                        break
-            
-            # Final check to ensure we don't exceed the block limit
-            if len(children) > 100:
-                logger.warning(f"Total blocks: {len(children)}, truncating to 100")
-                children = children[:99]
-                children.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Content truncated due to Notion's block limit."
-                                },
-                                "annotations": {
-                                    "italic": True,
-                                    "color": "red"
-                                }
-                            }
-                        ]
-                    }
-                })
-            
-            # Create the page
+            if source_url:
+                children.append(_paragraph(
+                    _text("Newsletter URL: ", bold=True),
+                    _text("Web Version", color="blue", link=source_url)
+                ))
+                children.append(_paragraph(
+                    _text("Original Email: ", bold=True),
+                    _text("Gmail Link", link=email_link)
+                ))
+            
+            # Add separator and content header
+            children.append(_divider())
+            children.append(_heading(2, _text("Newsletter Content"), color="blue_background"))
+            
+            # Create the page with just the header blocks
             try:
-                response = self.client.pages.create(
-                    parent={"database_id": self.database_id},
-                    properties=properties,
-                    children=children
-                )
-                logger.info(f"Created Notion entry: {email_data['subject']}")
-                return response
+                response = await self._create_page(properties, children)
             except APIResponseError as e:
-                logger.error(f"Notion API Error: {str(e)}")
-                # Fall back to creating a basic entry
-                return self._create_basic_entry(email_data, category)
+                logger.error("Notion API Error (%s): %s", e.code, e)
+                # Only a rejected payload can be fixed by sending less content,
+                # so fall back to a basic entry on validation errors alone,
+                # reloading the schema in case a cached property no longer exists
+                if e.code == APIErrorCode.ValidationError:
+                    if await self._refresh_database_properties() and retry_on_schema_change:
+                        logger.info("Notion database schema changed, retrying entry: %s", subject)
+                        return await self.create_entry(email_data, category, confidence, all_scores,
+                                                       retry_on_schema_change=False)
+                    return await self._create_basic_entry(email_data, category)
+                # Report the failure so the email stays unprocessed and is tried again later
+                return None
+            
+            # Only build the content once the page exists, then append it in chunks
+            # that fit Notion's per-request block limit
+            try:
+                await self._append_blocks(response["id"], self._create_content_blocks(email_data), len(children))
+            except Exception as e:
+                # The page is missing content, so archive it and report a failure to leave
+                # the email unprocessed rather than keeping a truncated copy next to the retry
+                logger.error("Error appending content to Notion entry %s, archiving the incomplete page: %s", subject, e)
+                await self._archive_page(response["id"])
+                return None
+            
+            logger.info("Created Notion entry: %s", subject)
+            return response
                 
         except Exception as e:
-            logger.error(f"Error creating Notion entry: {str(e)}")
+            logger.error("Error creating Notion entry: %s", e)
             return None
     
-    def _create_blocks_from_scraped_sections(self, sections: List[Dict]) -> List[Dict]:
-        """Create Notion blocks from scraped sections with length limits handling."""
-        blocks = []
+    def _create_content_blocks(self, email_data: Dict) -> Iterator[Dict]:
+        """Yield the page body blocks with the newsletter content and its links."""
+        # Determine how to process the content based on whether we have scraped sections
+        if email_data.get('sections'):
+            # Use the pre-scraped sections (from web scraping)
+            yield from self._create_blocks_from_scraped_sections(email_data['sections'])
+        else:
+            # Process the content from email body (traditional method)
+            yield from self._create_blocks_from_email_body(email_data['body'])
         
+        # If we have links, add them in a better formatted section
+        links = email_data['links']
+        if links:
+            # Add a divider before links section
+            yield _divider()
+            yield _heading(3, _text("Links"))
+            
+            # Add links as bullet points, skipping empty and repeated links
+            for link in dict.fromkeys(links):
+                if link and link != "#" and not link.startswith("javascript:"):
+                    yield _bullet(_text(link, link=link))
+    
+    def _create_blocks_from_scraped_sections(self, sections: List[Dict]) -> Iterator[Dict]:
+        """Yield Notion blocks from scraped sections with length limits handling."""
         for section in sections:
             # Add section heading if it has a name
             if section.get("name") and section["name"] != "Newsletter Content":
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": section["name"]
-                                }
-                            }
-                        ]
-                    }
-                })
+                yield _heading(3, _text(section["name"]))
             
             # Add content paragraphs with length limits
             for content_item in section.get("content", []):
@@ -563,7 +686,7 @@ class NotionService:
                         continue
                     
                     # Parse the content to extract title and description
-                    title_match = re.match(r'\*\*(.+?)\*\*\s*\n+(.+)', content_text, re.DOTALL)
+                    title_match = TITLE_DESCRIPTION_PATTERN.match(content_text)
                     
                     if title_match:
                         # We have a title and description format
@@ -571,96 +694,22 @@ class NotionService:
                         description = title_match.group(2).strip()
                         
                         # Create a heading with the title (potentially linked)
-                        title_block = {
-                            "object": "block",
-                            "type": "heading_3",
-                            "heading_3": {
-                                "rich_text": [
-                                    {
-                                        "type": "text",
-                                        "text": {
-                                            "content": title
-                                        }
-                                    }
-                                ]
-                            }
-                        }
-                        
-                        # Add URL to title if available
-                        if content_url:
-                            title_block["heading_3"]["rich_text"][0]["text"]["link"] = {"url": content_url}
-                            
-                        blocks.append(title_block)
+                        yield _heading(3, _text(title, link=content_url))
                         
                         # Add description in chunks if needed
-                        for chunk in self._split_text_into_chunks(description, 1900):
-                            blocks.append({
-                                "object": "block",
-                                "type": "paragraph",
-                                "paragraph": {
-                                    "rich_text": [
-                                        {
-                                            "type": "text",
-                                            "text": {
-                                                "content": chunk
-                                            }
-                                        }
-                                    ]
-                                }
-                            })
+                        for chunk in self._split_text_into_chunks(description):
+                            yield _paragraph(_text(chunk))
                             
                         # If we have a URL, add it as a separate line for clarity
                         if content_url:
-                            blocks.append({
-                                "object": "block",
-                                "type": "paragraph",
-                                "paragraph": {
-                                    "rich_text": [
-                                        {
-                                            "type": "text",
-                                            "text": {
-                                                "content": "Source: ",
-                                            },
-                                            "annotations": {
-                                                "bold": True
-                                            }
-                                        },
-                                        {
-                                            "type": "text",
-                                            "text": {
-                                                "content": content_url,
-                                                "link": {"url": content_url}
-                                            },
-                                            "annotations": {
-                                                "color": "blue"
-                                            }
-                                        }
-                                    ]
-                                }
-                            })
+                            yield _paragraph(
+                                _text("Source: ", bold=True),
+                                _text(content_url, color="blue", link=content_url)
+                            )
                     else:
                         # Just a regular paragraph, possibly with a link
-                        for chunk in self._split_text_into_chunks(content_text, 1900):
-                            paragraph_block = {
-                                "object": "block",
-                                "type": "paragraph",
-                                "paragraph": {
-                                    "rich_text": [
-                                        {
-                                            "type": "text",
-                                            "text": {
-                                                "content": chunk
-                                            }
-                                        }
-                                    ]
-                                }
-                            }
-                            
-                            # Add URL if available
-                            if content_url:
-                                paragraph_block["paragraph"]["rich_text"][0]["text"]["link"] = {"url": content_url}
-                                
-                            blocks.append(paragraph_block)
+                        for chunk in self._split_text_into_chunks(content_text):
+                            yield _paragraph(_text(chunk, link=content_url))
                 else:
                     # Handle legacy string format
                     content_str = content_item.strip()
@@ -668,26 +717,13 @@ class NotionService:
                         continue
                     
                     # Check if content is a bullet point
-                    if content_str.startswith('•') or content_str.startswith('*') or content_str.startswith('-'):
+                    if content_str.startswith(BULLET_PREFIXES):
                         # Split long bullet points
-                        for chunk in self._split_text_into_chunks(content_str[1:].strip(), 1900):
-                            blocks.append({
-                                "object": "block",
-                                "type": "bulleted_list_item",
-                                "bulleted_list_item": {
-                                    "rich_text": [
-                                        {
-                                            "type": "text",
-                                            "text": {
-                                                "content": chunk
-                                            }
-                                        }
-                                    ]
-                                }
-                            })
+                        for chunk in self._split_text_into_chunks(content_str[1:].strip()):
+                            yield _bullet(_text(chunk))
                     else:
                         # Parse for title/description format
-                        title_match = re.match(r'\*\*(.+?)\*\*\s*\n+(.+)', content_str, re.DOTALL)
+                        title_match = TITLE_DESCRIPTION_PATTERN.match(content_str)
                         
                         if title_match:
                             # We have a title and description format
@@ -695,192 +731,96 @@ class NotionService:
                             description = title_match.group(2).strip()
                             
                             # Add title as a heading
-                            blocks.append({
-                                "object": "block",
-                                "type": "heading_3",
-                                "heading_3": {
-                                    "rich_text": [
-                                        {
-                                            "type": "text",
-                                            "text": {
-                                                "content": title
-                                            }
-                                        }
-                                    ]
-                                }
-                            })
+                            yield _heading(3, _text(title))
                             
                             # Add description in chunks if needed
-                            for chunk in self._split_text_into_chunks(description, 1900):
-                                blocks.append({
-                                    "object": "block",
-                                    "type": "paragraph",
-                                    "paragraph": {
-                                        "rich_text": [
-                                            {
-                                                "type": "text",
-                                                "text": {
-                                                    "content": chunk
-                                                }
-                                            }
-                                        ]
-                                    }
-                                })
+                            for chunk in self._split_text_into_chunks(description):
+                                yield _paragraph(_text(chunk))
                         else:
                             # Split regular paragraphs into multiple paragraph blocks
-                            for chunk in self._split_text_into_chunks(content_str, 1900):
-                                blocks.append({
-                                    "object": "block",
-                                    "type": "paragraph",
-                                    "paragraph": {
-                                        "rich_text": [
-                                            {
-                                                "type": "text",
-                                                "text": {
-                                                    "content": chunk
-                                                }
-                                            }
-                                        ]
-                                    }
-                                })
-        
-        return blocks
+                            for chunk in self._split_text_into_chunks(content_str):
+                                yield _paragraph(_text(chunk))
     
-    def _create_blocks_from_email_body(self, body: str) -> List[Dict]:
-        """Create Notion blocks from email body with length limits handling."""
-        blocks = []
-        
+    def _create_blocks_from_email_body(self, body: str) -> Iterator[Dict]:
+        """Yield Notion blocks from email body with length limits handling."""
         # Split the body by double newlines to separate paragraphs
-        paragraphs = re.split(r'\n\s*\n', body)
-        
-        for paragraph in paragraphs:
+        for paragraph in PARAGRAPH_SPLIT_PATTERN.split(body):
             # Skip empty paragraphs
-            if not paragraph.strip():
+            stripped = paragraph.strip()
+            if not stripped:
                 continue
             
-            # Check if paragraph is a heading (starting with # or ##)
-            if re.match(r'^#+\s+', paragraph):
-                heading_level = len(re.match(r'^(#+)\s+', paragraph).group(1))
-                heading_text = re.sub(r'^#+\s+', '', paragraph)
+            # Check if paragraph is a heading (starting with # or ##), only running the regex when it can match
+            heading_match = HEADING_PATTERN.match(paragraph) if paragraph.startswith('#') else None
+            if heading_match:
+                heading_level = len(heading_match.group(1))
+                heading_text = paragraph[heading_match.end():]
                 
                 if heading_level <= 3:  # h1, h2, h3
-                    heading_type = f"heading_{heading_level}"
-                    blocks.append({
-                        "object": "block",
-                        "type": heading_type,
-                        heading_type: {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {
-                                        "content": heading_text[:1900]
-                                    }
-                                }
-                            ]
-                        }
-                    })
+                    yield _heading(heading_level, _text(heading_text[:MAX_TEXT_LENGTH]))
                 else:  # treat as paragraph for h4+
-                    for chunk in self._split_text_into_chunks(heading_text, 1900):
-                        blocks.append({
-                            "object": "block",
-                            "type": "paragraph",
-                            "paragraph": {
-                                "rich_text": [
-                                    {
-                                        "type": "text",
-                                        "text": {
-                                            "content": chunk
-                                        },
-                                        "annotations": {
-                                            "bold": True
-                                        }
-                                    }
-                                ]
-                            }
-                        })
+                    for chunk in self._split_text_into_chunks(heading_text):
+                        yield _paragraph(_text(chunk, bold=True))
             # Check if paragraph is a bullet list
-            elif paragraph.strip().startswith(('•', '*', '-')):
-                # Split into bullet items
-                bullet_items = re.split(r'\n\s*[•*-]\s*', paragraph)
-                # Remove first empty item if it exists
-                if bullet_items and not bullet_items[0].strip():
-                    bullet_items = bullet_items[1:]
-                    
-                for item in bullet_items:
+            elif stripped.startswith(BULLET_PREFIXES):
+                # Split into bullet items, skipping empty ones
+                for item in BULLET_SPLIT_PATTERN.split(paragraph):
                     if not item.strip():
                         continue
                         
                     # Split long bullet points
-                    for chunk in self._split_text_into_chunks(item, 1900):
-                        blocks.append({
-                            "object": "block",
-                            "type": "bulleted_list_item",
-                            "bulleted_list_item": {
-                                "rich_text": [
-                                    {
-                                        "type": "text",
-                                        "text": {
-                                            "content": chunk
-                                        }
-                                    }
-                                ]
-                            }
-                        })
+                    for chunk in self._split_text_into_chunks(item):
+                        yield _bullet(_text(chunk))
             else:
                 # Regular paragraph, split into chunks if needed
-                for chunk in self._split_text_into_chunks(paragraph, 1900):
-                    blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {
-                                        "content": chunk
-                                    }
-                                }
-                            ]
-                        }
-                    })
-        
-        return blocks
+                for chunk in self._split_text_into_chunks(paragraph):
+                    yield _paragraph(_text(chunk))
     
-    def _split_text_into_chunks(self, text: str, max_length: int = 1900) -> List[str]:
-        """Split text into chunks that are under the max_length limit."""
-        if not text:
-            return []
-            
-        if len(text) <= max_length:
-            return [text]
-            
-        chunks = []
-        current_text = text
+    def _plain_paragraphs(self, blocks: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield plain paragraph blocks with the text of the given blocks, dropping formatting and links."""
+        for block in blocks:
+            rich_text = block[block["type"]].get("rich_text", [])
+            text = "".join(item["text"]["content"] for item in rich_text)
+            for chunk in self._split_text_into_chunks(text):
+                if chunk.strip():
+                    yield _paragraph(_text(chunk))
+    
+    def _clean_preview(self, text: str) -> str:
+        """Collapse whitespace and remove markdown formatting characters for the Description preview."""
+        cleaned_text = WHITESPACE_PATTERN.sub(' ', text)
+        return FORMATTING_MARKS_PATTERN.sub('', cleaned_text)
+    
+    def _split_text_into_chunks(self, text: str, max_length: int = MAX_TEXT_LENGTH) -> Iterator[str]:
+        """Yield chunks of text that are under the max_length limit."""
+        start = 0
+        text_length = len(text)
         
-        while len(current_text) > max_length:
-            # Find a good breaking point
-            split_point = current_text[:max_length].rfind('. ')
+        # Walk the text by index so each chunk is sliced exactly once
+        while text_length - start > max_length:
+            end = start + max_length
+            
+            # Find a good breaking point within the current window
+            split_point = text.rfind('. ', start, end)
             if split_point == -1:
-                split_point = current_text[:max_length].rfind(' ')
+                split_point = text.rfind(' ', start, end)
             if split_point == -1:
-                split_point = max_length - 1
+                split_point = end - 1
             
-            # Add chunk and continue with remaining text
-            chunks.append(current_text[:split_point+1])
-            current_text = current_text[split_point+1:]
+            yield text[start:split_point + 1]
+            start = split_point + 1
         
-        # Add the final chunk
-        if current_text:
-            chunks.append(current_text)
-            
-        return chunks
+        # Yield the final chunk
+        if start < text_length:
+            yield text[start:]
     
-    def _create_basic_entry(self, email_data: Dict, category: str):
+    async def _create_basic_entry(self, email_data: Dict, category: str):
         """Create a basic Notion entry with minimal content when primary method fails."""
         try:
+            subject = email_data['subject']
+            
             # Just the essential properties
             properties = {
-                "Name": {"title": [{"text": {"content": email_data['subject']}}]}
+                "Name": {"title": [{"text": {"content": subject}}]}
             }
             
             # Add category if available
@@ -892,65 +832,23 @@ class NotionService:
                 properties["Date"] = {"date": {"start": email_data['date']}}
             
             # Create a simple paragraph with the content
-            children = [{
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "Content from: " + email_data['sender']
-                            }
-                        }
-                    ]
-                }
-            }]
-            
-            # Add simple content blocks in chunks to avoid length issues
-            content_chunks = self._split_text_into_chunks(email_data['body'], 1900)
-            for chunk in content_chunks[:95]:  # Limit to avoid block limits
-                children.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": chunk
-                                }
-                            }
-                        ]
-                    }
-                })
-            
-            # Add note if content was truncated
-            if len(content_chunks) > 95:
-                children.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "Content truncated (too long for Notion)."
-                                }
-                            }
-                        ]
-                    }
-                })
-            
-            response = self.client.pages.create(
-                parent={"database_id": self.database_id},
-                properties=properties,
-                children=children
-            )
+            children = [_paragraph(_text("Content from: " + email_data['sender']))]
+            
+            # Add simple content blocks in chunks to avoid length issues, sending as many
+            # as fit with the page and appending the rest in batches
+            content_blocks = (_paragraph(_text(chunk)) for chunk in self._split_text_into_chunks(email_data['body']))
+            children.extend(islice(content_blocks, MAX_BLOCKS_PER_REQUEST - len(children)))
+            
+            response = await self._create_page(properties, children)
+            try:
+                await self._append_blocks(response["id"], content_blocks, len(children))
+            except Exception:
+                await self._archive_page(response["id"])
+                raise
             
-            logger.info(f"Created basic Notion entry after error: {email_data['subject']}")
+            logger.info("Created basic Notion entry after error: %s", subject)
             return response
             
         except Exception as e:
-            logger.error(f"Even basic entry creation failed: {str(e)}")
+            logger.error("Even basic entry creation failed: %s", e)
             return None 
\ No newline at end of file
@@ -2,21 +2,44 @@
 Utilities module with helper functions.
 """
 import os
+import atexit
 import logging
+import queue
 import re
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
+# Precompiled pattern for stripping HTML tags
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Environment variables the application cannot run without
+REQUIRED_ENV_VARS = ("NOTION_TOKEN", "NOTION_DATABASE_ID")
+
 # Setup logging helpers
 def setup_logging(log_file="app.log", log_level=logging.INFO):
     """Set up logging with file and console handlers."""
+    # The log format doesn't include thread or process details, so skip collecting them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    
+    # Hand records to a background thread so logging calls don't wait on file and console writes
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued records on shutdown
+    
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+        format='%(message)s',  # Formatted by the listener's handlers
+        handlers=[QueueHandler(log_queue)]
     )
     
     # Return the root logger
@@ -33,31 +56,24 @@ def get_datetime_range(days_back: int) -> Dict:
     }
 
 def format_timestamp(timestamp: int) -> str:
-    """Format a unix timestamp to ISO format."""
-    return datetime.fromtimestamp(timestamp / 1000).isoformat()
+    """Format a unix timestamp in milliseconds to ISO format."""
+    # Split with integer math so the milliseconds aren't subject to float rounding
+    seconds, milliseconds = divmod(timestamp, 1000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=milliseconds * 1000).isoformat()
 
 # String helpers
 def truncate_text(text: str, max_length: int) -> str:
     """Truncate text to a maximum length with ellipsis."""
-    if len(text) <= max_length:
-        return text
-    return text[:max_length - 3] + "..."
+    return text if len(text) <= max_length else text[:max_length - 3] + "..."
 
 def clean_html(html_content: str) -> str:
     """Remove HTML tags and clean up whitespace."""
     # Simple HTML tag removal (a more robust solution would use a library like BeautifulSoup)
-    text = re.sub(r'<[^>]+>', ' ', html_content)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    text = HTML_TAG_PATTERN.sub(' ', html_content)
+    # Splitting on whitespace collapses runs and trims the ends without a second regex pass
+    return ' '.join(text.split())
 
 # Environment helpers
 def check_environment() -> List[str]:
     """Check if all required environment variables are set."""
-    required_vars = ["NOTION_TOKEN", "NOTION_DATABASE_ID"]
-    missing = []
-    
-    for var in required_vars:
-        if not os.getenv(var):
-            missing.append(var)
-            
-    return missing 
\ No newline at end of file
+    return [var for var in REQUIRED_ENV_VARS if not os.getenv(var)] 
\ No newline at end of file
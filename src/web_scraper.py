@@ -4,14 +4,64 @@ Web scraper module to extract newsletter content from online versions.
 import re
 import logging
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Tuple
-import json
+from collections import defaultdict
+import soupsieve
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from datetime import timedelta
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Set, Tuple
 
 import config
 
 logger = logging.getLogger("gmail_notion_manager.scraper")
 
+# SQLite file caching fetched newsletter pages between runs
+RESPONSE_CACHE_FILE = "scraper_cache.sqlite"
+
+# Common patterns for "view online" links, in order of preference
+VIEW_ONLINE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'href="(https?://[^"]*(?:view|browser)[^"]*(?:online|web|browser)[^"]*)"',
+    r'href="(https?://[^"]*(?:web|browser)[^"]*(?:version|view)[^"]*)"',
+    r'href="(https?://(?:view|online|newsletter)[^"]*\.[a-z]+/[^"]*)"',
+    r'href="(https?://[^"]*(?:campaign-archive|mailchi\.mp)[^"]*)"',
+    r'href="(https?://tracking\.tldrnewsletter\.com[^"]*)"',
+    r'href="(https?://.*tldrnewsletter\.com[^"]*)"',
+    r'href="(https?://[^"]*(?:a\.tldr)[^"]*)"'
+)]
+
+# Keywords in a TLDR text block that identify its section, checked in order
+SECTION_NAME_PATTERNS = [(re.compile(pattern, re.IGNORECASE), name) for pattern, name in (
+    (r'Vulnerab|Attack', "Attacks & Vulnerabilities"),
+    (r'Strateg|Tactic', "Strategies & Tactics"),
+    (r'Launch|Tool', "Launches & Tools"),
+    (r'Quick|Link', "Quick Links"),
+    (r'Misc', "Miscellaneous")
+)]
+
+# Precompiled CSS selectors for the TLDR section icons and article description spans
+SECTION_ICON_SELECTOR = soupsieve.compile('span[style*="font-size: 36px"]')
+DESCRIPTION_SPAN_SELECTOR = soupsieve.compile('span[style*="font-family"][style*="Helvetica"]')
+
+# Target of a meta refresh tag, e.g. content="0; url=https://..."
+META_REFRESH_URL_PATTERN = re.compile(r'url=(.*)', re.IGNORECASE)
+
+# Maximum number of meta refresh redirects followed for a single page
+MAX_META_REFRESH_REDIRECTS = 5
+
+# Runs of whitespace collapsed in article descriptions
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# String types that make up an element's .text
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+# Tags counted when judging whether a container holds structured content
+STRUCTURE_TAG_NAMES = frozenset(('h1', 'h2', 'h3', 'p'))
+
+# Heading tags that start a new section in generic newsletters
+HEADING_TAG_NAMES = frozenset(('h1', 'h2', 'h3', 'h4'))
+
 class WebScraper:
     """Handles web scraping of online newsletter versions."""
     
@@ -22,6 +72,28 @@ class WebScraper:
             'Accept': 'text/html,application/xhtml+xml,application/xml',
             'Accept-Language': 'en-US,en;q=0.9'
         }
+        
+        # Reuse connections across requests instead of opening a new TCP/TLS connection for each page.
+        # Pages are also cached on disk, so re-fetching a newsletter is a local hit or a conditional request
+        cache_hours = config.SETTINGS["scraping_cache_hours"]
+        if cache_hours > 0:
+            self.session = CachedSession(
+                RESPONSE_CACHE_FILE,
+                backend='sqlite',
+                expire_after=timedelta(hours=cache_hours),
+                allowable_codes=(200,)
+            )
+        else:
+            self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Keep a pooled connection per scraping thread, so concurrent fetches from one host aren't discarded
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=config.SETTINGS["scraping_concurrency"],
+            max_retries=Retry(total=3, backoff_factor=0.5)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def extract_view_online_link(self, html_content: str) -> Optional[str]:
         """Extract the 'View Online' link from newsletter HTML."""
@@ -29,30 +101,19 @@ class WebScraper:
             logger.warning("No HTML content provided to extract View Online link")
             return None
             
-        # Common patterns for "view online" links
-        patterns = [
-            r'href="(https?://[^"]*(?:view|browser)[^"]*(?:online|web|browser)[^"]*)"',
-            r'href="(https?://[^"]*(?:web|browser)[^"]*(?:version|view)[^"]*)"',
-            r'href="(https?://(?:view|online|newsletter)[^"]*\.[a-z]+/[^"]*)"',
-            r'href="(https?://[^"]*(?:campaign-archive|mailchi\.mp)[^"]*)"',
-            r'href="(https?://tracking\.tldrnewsletter\.com[^"]*)"',
-            r'href="(https?://.*tldrnewsletter\.com[^"]*)"',
-            r'href="(https?://[^"]*(?:a\.tldr)[^"]*)"'
-        ]
-        
-        logger.debug(f"Searching for View Online link in HTML content of length {len(html_content)}")
-        for pattern in patterns:
-            matches = re.findall(pattern, html_content, re.IGNORECASE)
-            if matches:
+        logger.debug("Searching for View Online link in HTML content of length %d", len(html_content))
+        for pattern in VIEW_ONLINE_PATTERNS:
+            # Only the first match is used, so stop searching as soon as one is found
+            match = pattern.search(html_content)
+            if match:
                 # Clean up URL if needed
-                url = matches[0]
+                url = match.group(1)
                 url = url.replace('&amp;', '&')
                 logger.info(f"Found 'View Online' link: {url}")
                 return url
         
         # Log a sample of the HTML content for debugging
-        sample_length = min(500, len(html_content))
-        logger.debug(f"No 'View Online' link found. HTML sample: {html_content[:sample_length]}...")
+        logger.debug("No 'View Online' link found. HTML sample: %.500s...", html_content)
         return None
     
     def scrape_newsletter_content(self, url: str) -> Tuple[Optional[List[Dict]], Optional[List[str]], str]:
@@ -61,52 +122,55 @@ class WebScraper:
         Returns a tuple of (sections, links, url)
         """
         try:
-            logger.info(f"Scraping content from: {url}")
-            
-            # Store the original URL as the default return value
-            final_url = url
-            
             # Use the configured timeout from settings
             timeout = config.SETTINGS["scraping_timeout"]
             
-            response = requests.get(url, headers=self.headers, timeout=timeout)
-            response.raise_for_status()
-            
-            logger.debug(f"Response received: {len(response.text)} bytes, status {response.status_code}")
-            
-            # Update final URL in case of redirects
-            if response.url != url:
-                final_url = response.url
-                logger.debug(f"URL redirected to: {final_url}")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Log the page title for reference
-            title = soup.find('title')
-            if title:
-                logger.info(f"Page title: {title.text.strip()}")
-            
-            # Handle redirects
-            if soup.find('meta', attrs={'http-equiv': 'refresh'}):
-                meta_refresh = soup.find('meta', attrs={'http-equiv': 'refresh'})
-                content = meta_refresh.get('content', '')
-                if 'url=' in content.lower():
-                    redirect_url = content.split('url=')[1].strip()
-                    logger.info(f"Following redirect to: {redirect_url}")
-                    return self.scrape_newsletter_content(redirect_url)
+            # Follow meta refresh redirects in a loop, giving up after a fixed number of hops
+            for _ in range(MAX_META_REFRESH_REDIRECTS + 1):
+                logger.info(f"Scraping content from: {url}")
+                
+                # Store the requested URL as the default return value
+                final_url = url
+                
+                response = self.session.get(url, timeout=timeout)
+                response.raise_for_status()
+                
+                logger.debug("Response received: %d bytes, status %s", len(response.content), response.status_code)
+                
+                # Update final URL in case of redirects
+                if response.url != url:
+                    final_url = response.url
+                    logger.debug("URL redirected to: %s", final_url)
+                
+                # Parse the raw bytes with the declared encoding so the page isn't decoded twice
+                soup = self._parse_html(response.content, response.encoding)
+                
+                # Log the page title for reference
+                title = soup.find('title')
+                if title:
+                    logger.info(f"Page title: {title.text.strip()}")
+                
+                # Handle redirects
+                redirect_url = self._get_meta_refresh_url(soup)
+                if not redirect_url:
+                    break
+                logger.info(f"Following redirect to: {redirect_url}")
+                url = redirect_url
+            else:
+                logger.error(f"Too many meta refresh redirects, stopping at {url}")
+                return None, None, url
             
-            # Extract all links first
-            links = []
-            for a_tag in soup.find_all('a', href=True):
-                link = a_tag.get('href', '')
-                if link and link.startswith('http') and link not in links:
-                    links.append(link)
+            # Extract all links first, dropping duplicates while keeping their order
+            links = list(dict.fromkeys(
+                a_tag['href'] for a_tag in soup.find_all('a', href=True) if a_tag['href'].startswith('http')
+            ))
             
-            logger.debug(f"Found {len(links)} links on the page")
+            logger.debug("Found %d links on the page", len(links))
             
-            # Log some basic page structure info
-            logger.debug(f"Page structure: {len(soup.find_all('div'))} divs, {len(soup.find_all('p'))} paragraphs, " 
-                       f"{len(soup.find_all(['h1', 'h2', 'h3', 'h4']))} headings")
+            # Log some basic page structure info, only walking the tree when it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Page structure: %d divs, %d paragraphs, %d headings", len(soup.find_all('div')),
+                             len(soup.find_all('p')), len(soup.find_all(['h1', 'h2', 'h3', 'h4'])))
             
             # TLDR newsletter specific handling
             logger.info("Attempting TLDR-specific extraction method")
@@ -114,7 +178,7 @@ class WebScraper:
             if sections:
                 logger.info(f"Successfully extracted content using TLDR-specific method: {len(sections)} sections")
                 self._log_extracted_content(sections)
-                logger.debug(f"Returning final URL: {final_url}")
+                logger.debug("Returning final URL: %s", final_url)
                 return sections, links, final_url
             
             # Generic newsletter handling
@@ -123,7 +187,7 @@ class WebScraper:
             if sections:
                 logger.info(f"Successfully extracted content using generic method: {len(sections)} sections")
                 self._log_extracted_content(sections)
-                logger.debug(f"Returning final URL: {final_url}")
+                logger.debug("Returning final URL: %s", final_url)
                 return sections, links, final_url
             
             # Fall back to basic content extraction
@@ -135,34 +199,54 @@ class WebScraper:
             else:
                 logger.error("Basic extraction failed to find any content")
             
-            logger.debug(f"Returning final URL: {final_url}")
+            logger.debug("Returning final URL: %s", final_url)
             return sections, links, final_url
             
         except Exception as e:
             logger.error(f"Error scraping {url}: {str(e)}", exc_info=True)
             # Even on error, return the original URL
-            logger.debug(f"Returning original URL due to error: {url}")
+            logger.debug("Returning original URL due to error: %s", url)
             return None, None, url
     
+    def _get_meta_refresh_url(self, soup: BeautifulSoup) -> Optional[str]:
+        """Get the target URL of the page's meta refresh tag, if it has one."""
+        meta_refresh = soup.find('meta', attrs={'http-equiv': 'refresh'})
+        if not meta_refresh:
+            return None
+        
+        match = META_REFRESH_URL_PATTERN.search(meta_refresh.get('content', ''))
+        return match.group(1).strip() if match else None
+    
+    def _parse_html(self, markup: bytes, encoding: Optional[str] = None) -> BeautifulSoup:
+        """Parse HTML with the fast lxml parser, falling back to html.parser if lxml fails."""
+        try:
+            return BeautifulSoup(markup, 'lxml', from_encoding=encoding)
+        except Exception as e:
+            logger.warning(f"lxml could not parse the page, falling back to html.parser: {str(e)}")
+            return BeautifulSoup(markup, 'html.parser', from_encoding=encoding)
+    
     def _log_extracted_content(self, sections: List[Dict]):
         """Log extracted content summary for debugging."""
         try:
             total_paragraphs = 0
             section_names = []
+            log_previews = logger.isEnabledFor(logging.DEBUG)
             
             for section in sections:
                 section_names.append(section.get("name", "Unnamed section"))
                 total_paragraphs += len(section.get("content", []))
                 
                 # Log first few words of each content section to verify extraction
+                if not log_previews:
+                    continue
                 for i, content in enumerate(section.get("content", [])[:3]):  # Log up to 3 content items per section
                     # Content might be a dictionary if we've extracted article URLs
                     if isinstance(content, dict):
                         preview = content.get("text", "")[:50] + "..." if len(content.get("text", "")) > 50 else content.get("text", "")
-                        logger.debug(f"Section '{section.get('name', 'Unnamed')}' item {i+1}: {preview}")
+                        logger.debug("Section '%s' item %d: %s", section.get('name', 'Unnamed'), i+1, preview)
                     else:
                         preview = content[:50] + "..." if len(content) > 50 else content
-                        logger.debug(f"Section '{section.get('name', 'Unnamed')}' item {i+1}: {preview}")
+                        logger.debug("Section '%s' item %d: %s", section.get('name', 'Unnamed'), i+1, preview)
                 
             logger.info(f"Extracted content summary: {len(sections)} sections, {total_paragraphs} paragraphs")
             logger.info(f"Section names: {', '.join(section_names)}")
@@ -173,16 +257,17 @@ class WebScraper:
         """Extract content specifically from TLDR newsletters."""
         # Check if this is likely a TLDR newsletter
         is_tldr = False
-        if soup.find('title') and 'TLDR' in soup.find('title').text:
+        title = soup.find('title')
+        if title and 'TLDR' in title.text:
             is_tldr = True
             logger.info("Detected TLDR newsletter format based on title")
         
-        # Also check for TLDR in other key places
+        # Also check for TLDR in other key places, stopping at the first mention
         if not is_tldr:
-            tldr_elements = soup.find_all(string=lambda text: text and 'TLDR' in text)
-            if tldr_elements:
+            tldr_element = soup.find(string=lambda text: text and 'TLDR' in text)
+            if tldr_element:
                 is_tldr = True
-                logger.info(f"Detected TLDR newsletter format based on content (found {len(tldr_elements)} TLDR mentions)")
+                logger.info("Detected TLDR newsletter format based on content")
         
         if is_tldr:
             logger.debug("Starting TLDR-specific content extraction")
@@ -190,24 +275,31 @@ class WebScraper:
             
             # TLDR newsletters have a specific table-based structure
             # First, try to find section header emojis which are typically in spans with font-size: 36px
-            section_icons = soup.find_all('span', style=lambda s: s and 'font-size: 36px' in s)
-            logger.debug(f"Found {len(section_icons)} section icons/emojis")
+            section_icons = SECTION_ICON_SELECTOR.select(soup)
+            logger.debug("Found %d section icons/emojis", len(section_icons))
             
             section_headers = []
+            log_headers = logger.isEnabledFor(logging.DEBUG)  # Header text is only needed for the debug log
             for icon in section_icons:
                 # Find the next h1 after the icon
                 next_header = icon.find_next(['h1', 'h2'])
                 if next_header:
                     section_headers.append(next_header)
-                    logger.debug(f"Found section header with icon: {next_header.text.strip()}")
+                    if log_headers:
+                        logger.debug("Found section header with icon: %s", next_header.text.strip())
             
             if section_headers:
                 logger.info(f"Found {len(section_headers)} TLDR section headers with icons")
                 
+                # Collect the tables and headings in document order once, so each section can
+                # slice its range instead of walking the tree node by node with find_next
+                landmarks = soup.find_all(['table', 'h1', 'h2'])
+                landmark_index = {id(landmark): i for i, landmark in enumerate(landmarks)}
+                
                 # Process each section and its content
                 for i, header in enumerate(section_headers):
                     section_name = header.text.strip()
-                    logger.debug(f"Processing section: {section_name}")
+                    logger.debug("Processing section: %s", section_name)
                     
                     # Collect all content tables until the next section header
                     next_header = section_headers[i+1] if i+1 < len(section_headers) else None
@@ -218,35 +310,26 @@ class WebScraper:
                         parent_table = parent_table.parent
                     
                     if not parent_table:
-                        logger.debug(f"Could not find parent table for section: {section_name}")
+                        logger.debug("Could not find parent table for section: %s", section_name)
                         continue
                     
                     # Now find the content tables - typically tables with class text-block
                     # TLDR newsletters often have content in <table><tbody><tr><td class="container"><div class="text-block">
                     content_tables = []
                     
-                    # First find all potential tables that might contain content
-                    if next_header:
-                        # Get tables between this header and next header
-                        current = header
-                        while current and current != next_header:
-                            # Look for tables with text-block divs inside
-                            if current.name == 'table':
-                                for text_block in current.find_all('div', class_='text-block'):
-                                    # Only add if contains substantial content (avoid headers/ads)
-                                    if len(text_block.text.strip()) > 50:
-                                        content_tables.append(text_block)
-                            current = current.find_next(['table', 'h1', 'h2'])
-                    else:
-                        # For the last section, get all remaining relevant tables
-                        current = header.find_next('table')
-                        while current:
+                    # First find all potential tables that might contain content: those between this
+                    # header and the next one, or all remaining tables for the last section
+                    for current in landmarks[landmark_index[id(header)]:]:
+                        if next_header and current == next_header:
+                            break
+                        # Look for tables with text-block divs inside
+                        if current.name == 'table':
                             for text_block in current.find_all('div', class_='text-block'):
+                                # Only add if contains substantial content (avoid headers/ads)
                                 if len(text_block.text.strip()) > 50:
                                     content_tables.append(text_block)
-                            current = current.find_next('table')
                     
-                    logger.debug(f"Found {len(content_tables)} content blocks for section: {section_name}")
+                    logger.debug("Found %d content blocks for section: %s", len(content_tables), section_name)
                     
                     # Now extract the content from each table
                     section_content = []
@@ -255,6 +338,9 @@ class WebScraper:
                         # Look for article items which typically have a title in <strong> and a description
                         articles = []
                         
+                        # The description is the same for every link in the table, so it's looked up once
+                        description = None
+                        
                         # First check for "a" tags with strong elements (typical article format)
                         for link in content_table.find_all('a'):
                             strong = link.find('strong')
@@ -263,30 +349,16 @@ class WebScraper:
                                 article_title = strong.text.strip()
                                 
                                 # Find the description - typically in a span after the strong
-                                description = ""
-                                
                                 # Look for the span with the font-family containing "Helvetica"
                                 # This is a common pattern in TLDR newsletters for descriptions
-                                desc_span = content_table.find('span', style=lambda s: s and 'font-family' in s and 'Helvetica' in s)
-                                if desc_span:
-                                    description = desc_span.text.strip()
+                                if description is None:
+                                    desc_span = DESCRIPTION_SPAN_SELECTOR.select_one(content_table)
+                                    description = desc_span.text.strip() if desc_span else ""
                                 
                                 # If we found both title and description, add as an article
                                 if article_title and description:
                                     # Format the title and description more nicely
-                                    # Convert "Title (X minute read)" to "Title [X minute read]"
-                                    formatted_title = article_title
-                                    if '(' in article_title and ')' in article_title and 'read' in article_title:
-                                        title_parts = article_title.split('(')
-                                        main_title = title_parts[0].strip()
-                                        read_time = title_parts[1].strip().rstrip(')')
-                                        formatted_title = f"{main_title} [{read_time}]"
-                                    
-                                    # Clean up whitespace in the description
-                                    formatted_desc = re.sub(r'\s+', ' ', description).strip()
-                                    
-                                    # Format as a proper article with title and description
-                                    article_text = f"**{formatted_title}**\n\n{formatted_desc}"
+                                    formatted_title, article_text = self._format_article(article_title, description)
                                     
                                     # Instead of just adding the text, create a dict with text and url
                                     if article_url and article_url.startswith('http'):
@@ -295,14 +367,14 @@ class WebScraper:
                                             "url": article_url,
                                             "title": formatted_title
                                         })
-                                        logger.debug(f"Found article with URL: {formatted_title[:50]}... -> {article_url}")
+                                        logger.debug("Found article with URL: %.50s... -> %s", formatted_title, article_url)
                                     else:
                                         articles.append({
                                             "text": article_text,
                                             "url": None,
                                             "title": formatted_title
                                         })
-                                        logger.debug(f"Found article without URL: {formatted_title[:50]}...")
+                                        logger.debug("Found article without URL: %.50s...", formatted_title)
                         
                         # If we didn't find articles with the above method, try another approach
                         if not articles:
@@ -318,14 +390,14 @@ class WebScraper:
                                             "url": parent_a.get('href', ''),
                                             "title": text[:50] + "..." if len(text) > 50 else text
                                         })
-                                        logger.debug(f"Added content with URL: {text[:50]}...")
+                                        logger.debug("Added content with URL: %.50s...", text)
                                     else:
                                         section_content.append({
                                             "text": text,
                                             "url": None,
                                             "title": None
                                         })
-                                        logger.debug(f"Added content without URL: {text[:50]}...")
+                                        logger.debug("Added content without URL: %.50s...", text)
                         else:
                             # Add all the articles we found
                             section_content.extend(articles)
@@ -347,16 +419,16 @@ class WebScraper:
             if not sections:
                 logger.info("Trying direct table cell extraction for TLDR newsletter")
                 
-                # Find all tables with a container class
-                all_tables = soup.find_all('table')
-                logger.debug(f"Found {len(all_tables)} tables in total")
+                # Count the tables only when it will be logged
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Found %d tables in total", len(soup.find_all('table')))
                 
                 # TLDR newsletters typically have their articles in tables with cells that have the "container" class
                 article_cells = soup.find_all('td', class_='container')
-                logger.debug(f"Found {len(article_cells)} container cells that might contain articles")
+                logger.debug("Found %d container cells that might contain articles", len(article_cells))
                 
                 # Group content by common patterns
-                categorized_content = {}
+                categorized_content = defaultdict(list)
                 
                 for cell in article_cells:
                     # Skip cells that are too small to be actual content
@@ -377,16 +449,11 @@ class WebScraper:
                         section_name = prev_elem.text.strip()
                     
                     # Check for specific section identifiers
-                    if re.search(r'Vulnerab|Attack', text_block.text, re.IGNORECASE):
-                        section_name = "Attacks & Vulnerabilities"
-                    elif re.search(r'Strateg|Tactic', text_block.text, re.IGNORECASE):
-                        section_name = "Strategies & Tactics"
-                    elif re.search(r'Launch|Tool', text_block.text, re.IGNORECASE):
-                        section_name = "Launches & Tools"
-                    elif re.search(r'Quick|Link', text_block.text, re.IGNORECASE):
-                        section_name = "Quick Links"
-                    elif re.search(r'Misc', text_block.text, re.IGNORECASE):
-                        section_name = "Miscellaneous"
+                    text_block_text = text_block.text
+                    for pattern, name in SECTION_NAME_PATTERNS:
+                        if pattern.search(text_block_text):
+                            section_name = name
+                            break
                     
                     # Now extract the article content from the text block
                     content_items = []
@@ -395,32 +462,23 @@ class WebScraper:
                     articles_found = False
                     
                     # Pattern: <a href="..."><strong>Title (X min read)</strong></a><br><span>Description</span>
+                    description = None  # Shared by every link in the block, so it's looked up once
                     for link in text_block.find_all('a'):
                         strong = link.find('strong')
-                        if strong and '(' in strong.text and ')' in strong.text:  # Pattern like "Title (X min read)"
-                            article_title = strong.text.strip()
+                        strong_text = strong.text if strong else ""
+                        if '(' in strong_text and ')' in strong_text:  # Pattern like "Title (X min read)"
+                            article_title = strong_text.strip()
                             
                             # Find description - look for the span with Helvetica font
-                            span_elem = text_block.find('span', style=lambda s: s and 'font-family' in s and 'Helvetica' in s)
-                            if span_elem:
-                                description = span_elem.text.strip()
-                                if description and len(description) > 30:
-                                    # Format the title and description nicely
-                                    formatted_title = article_title
-                                    if '(' in article_title and ')' in article_title and 'read' in article_title:
-                                        title_parts = article_title.split('(')
-                                        main_title = title_parts[0].strip()
-                                        read_time = title_parts[1].strip().rstrip(')')
-                                        formatted_title = f"{main_title} [{read_time}]"
-                                    
-                                    # Clean up whitespace in the description
-                                    formatted_desc = re.sub(r'\s+', ' ', description).strip()
-                                    
-                                    # Format as a proper article
-                                    article_text = f"**{formatted_title}**\n\n{formatted_desc}"
-                                    content_items.append(article_text)
-                                    articles_found = True
-                                    logger.debug(f"Extracted article: {formatted_title[:50]}...")
+                            if description is None:
+                                span_elem = DESCRIPTION_SPAN_SELECTOR.select_one(text_block)
+                                description = span_elem.text.strip() if span_elem else ""
+                            if description and len(description) > 30:
+                                # Format the title and description nicely
+                                formatted_title, article_text = self._format_article(article_title, description)
+                                content_items.append(article_text)
+                                articles_found = True
+                                logger.debug("Extracted article: %.50s...", formatted_title)
                     
                     # If we didn't find articles, try to extract paragraphs directly
                     if not articles_found:
@@ -429,12 +487,10 @@ class WebScraper:
                                 text = p.text.strip()
                                 if text and len(text) > 50:
                                     content_items.append(text)
-                                    logger.debug(f"Extracted paragraph: {text[:50]}...")
+                                    logger.debug("Extracted paragraph: %.50s...", text)
                     
                     # Add content to the appropriate section
                     if content_items:
-                        if section_name not in categorized_content:
-                            categorized_content[section_name] = []
                         categorized_content[section_name].extend(content_items)
                 
                 # Convert categorized content to sections
@@ -455,7 +511,7 @@ class WebScraper:
                 
                 # Find all text-block divs
                 text_blocks = soup.find_all('div', class_='text-block')
-                logger.debug(f"Found {len(text_blocks)} text blocks")
+                logger.debug("Found %d text blocks", len(text_blocks))
                 
                 # Analyze each text block to see if it contains an article
                 articles = []
@@ -474,32 +530,14 @@ class WebScraper:
                         title = strong.text.strip()
                         # Look for nearby text that could be the description
                         parent = strong.parent.parent  # Get the parent of the 'a' tag
-                        # Clone the block to avoid modifying original
-                        clone = BeautifulSoup(str(parent), 'html.parser')
-                        # Remove the strong/link elements
-                        for s in clone.find_all('strong'):
-                            s.extract()
-                        for a in clone.find_all('a'):
-                            a.extract()
-                        # Get remaining text as description
-                        desc = clone.text.strip()
+                        # Get the text outside the strong/link elements as description
+                        desc = self._text_outside(parent, ('strong', 'a')).strip()
                         
                         if title and desc and len(desc) > 30:
                             # Format the title and description nicely
-                            formatted_title = title
-                            if '(' in title and ')' in title and 'read' in title:
-                                title_parts = title.split('(')
-                                main_title = title_parts[0].strip()
-                                read_time = title_parts[1].strip().rstrip(')')
-                                formatted_title = f"{main_title} [{read_time}]"
-                            
-                            # Clean up whitespace in the description
-                            formatted_desc = re.sub(r'\s+', ' ', desc).strip()
-                            
-                            # Format as a proper article
-                            article_text = f"**{formatted_title}**\n\n{formatted_desc}"
+                            formatted_title, article_text = self._format_article(title, desc)
                             articles.append(article_text)
-                            logger.debug(f"Extracted article from text block: {formatted_title[:50]}...")
+                            logger.debug("Extracted article from text block: %.50s...", formatted_title)
                 
                 if articles:
                     sections.append({
@@ -511,6 +549,38 @@ class WebScraper:
         
         return None
     
+    def _text_outside(self, tag, excluded_names: Tuple[str, ...]) -> str:
+        """Get the text of a tag, leaving out the text inside descendants with the excluded names."""
+        if tag.name in excluded_names:
+            return ""
+        
+        texts = []
+        for string in tag.strings:
+            # Walk up to the tag, stopping early if the string sits inside an excluded element
+            element = string.parent
+            while element is not tag and element.name not in excluded_names:
+                element = element.parent
+            if element is tag:
+                texts.append(string)
+        return "".join(texts)
+    
+    def _format_article(self, title: str, description: str) -> Tuple[str, str]:
+        """
+        Format an article title and description as article text.
+        Returns a tuple of (formatted_title, article_text)
+        """
+        # Convert "Title (X minute read)" to "Title [X minute read]"
+        formatted_title = title
+        if '(' in title and ')' in title and 'read' in title:
+            main_title, _, rest = title.partition('(')
+            read_time = rest.partition('(')[0].strip().rstrip(')')
+            formatted_title = f"{main_title.strip()} [{read_time}]"
+        
+        # Clean up whitespace in the description
+        formatted_desc = WHITESPACE_PATTERN.sub(' ', description).strip()
+        
+        return formatted_title, f"**{formatted_title}**\n\n{formatted_desc}"
+    
     def _extract_generic_newsletter(self, soup: BeautifulSoup) -> Optional[List[Dict]]:
         """Extract content from a generic newsletter format."""
         logger.debug("Starting generic newsletter extraction")
@@ -526,7 +596,7 @@ class WebScraper:
         
         main_content = None
         for selector in content_selectors:
-            logger.debug(f"Trying selector: {selector}")
+            logger.debug("Trying selector: %s", selector)
             tag, *classes = selector.split('.')
             if '#' in tag:
                 tag, id_val = tag.split('#')
@@ -545,35 +615,37 @@ class WebScraper:
             logger.info("Using heuristic approach to find main content")
             # Find the div with the most text content that's not too shallow
             candidates = soup.find_all(['div', 'section'], recursive=True)
-            logger.debug(f"Found {len(candidates)} potential content containers")
+            logger.debug("Found %d potential content containers", len(candidates))
             
             if candidates:
+                # Measure every element in one pass instead of walking each candidate's subtree
+                measures = self._measure_elements(soup)
+                
                 # Filter candidates to those with enough content but not the whole page
                 min_length = 200
-                max_length = len(soup.text) * 0.9
+                max_length = measures[id(soup)][0] * 0.9
                 
-                content_candidates = [c for c in candidates if 
-                                     len(c.text) > min_length and 
-                                     len(c.text) < max_length and
-                                     len(list(c.find_all(['h1', 'h2', 'h3', 'p'], recursive=True))) > 3]
+                content_candidates = [(c, measures[id(c)][0]) for c in candidates if 
+                                     min_length < measures[id(c)][0] < max_length and
+                                     measures[id(c)][1] > 3]
                 
-                logger.debug(f"Filtered to {len(content_candidates)} candidates with appropriate content volume")
+                logger.debug("Filtered to %d candidates with appropriate content volume", len(content_candidates))
                 
                 if content_candidates:
-                    main_content = max(content_candidates, key=lambda x: len(x.text))
-                    logger.info(f"Selected main content container with {len(main_content.text)} characters")
+                    main_content, main_length = max(content_candidates, key=lambda candidate: candidate[1])
+                    logger.info(f"Selected main content container with {main_length} characters")
         
         if main_content:
-            logger.debug(f"Main content type: {main_content.name}, class: {main_content.get('class')}, id: {main_content.get('id')}")
+            logger.debug("Main content type: %s, class: %s, id: %s", main_content.name, main_content.get('class'), main_content.get('id'))
             
-            # Log headings found
-            all_headings = main_content.find_all(['h1', 'h2', 'h3', 'h4'])
-            logger.debug(f"Found {len(all_headings)} headings in main content")
-            for h in all_headings[:5]:  # Log first 5 headings
-                logger.debug(f"Heading ({h.name}): {h.text.strip()}")
+            # Find the headings once, both for logging and for extracting structured content
+            headings = main_content.find_all(['h1', 'h2', 'h3', 'h4'])
+            logger.debug("Found %d headings in main content", len(headings))
+            if logger.isEnabledFor(logging.DEBUG):
+                for h in headings[:5]:  # Log first 5 headings
+                    logger.debug("Heading (%s): %s", h.name, h.text.strip())
             
             # First try to extract structured content using headers
-            headings = main_content.find_all(['h1', 'h2', 'h3', 'h4'])
             
             if headings:
                 logger.info(f"Extracting content using {len(headings)} headings")
@@ -583,18 +655,18 @@ class WebScraper:
                 # Gather text before the first heading
                 intro_elements = []
                 for element in main_content.children:
-                    if element.name in ['h1', 'h2', 'h3', 'h4']:
+                    if element.name in HEADING_TAG_NAMES:
                         break
                     if element.name == 'p':
                         text = element.text.strip()
                         if text:
                             intro_elements.append(text)
-                            logger.debug(f"Intro paragraph: {text[:50]}...")
+                            logger.debug("Intro paragraph: %.50s...", text)
                 
                 if intro_elements:
                     current_section["content"] = intro_elements
                     sections.append(current_section)
-                    logger.debug(f"Added introduction section with {len(intro_elements)} paragraphs")
+                    logger.debug("Added introduction section with %d paragraphs", len(intro_elements))
                 
                 # Process each heading and its content
                 for heading in headings:
@@ -603,44 +675,47 @@ class WebScraper:
                         "name": heading.text.strip(),
                         "content": []
                     }
-                    logger.debug(f"Processing section: {current_section['name']}")
+                    logger.debug("Processing section: %s", current_section['name'])
                     
                     # Get content until next heading
                     current_element = heading.next_sibling
-                    while current_element and not (hasattr(current_element, 'name') and 
-                                                 current_element.name in ['h1', 'h2', 'h3', 'h4']):
-                        if hasattr(current_element, 'name'):
-                            if current_element.name == 'p':
-                                text = current_element.text.strip()
-                                if text:
-                                    current_section["content"].append(text)
-                                    logger.debug(f"Added paragraph: {text[:50]}...")
-                            elif current_element.name == 'ul':
-                                for li in current_element.find_all('li'):
-                                    text = li.text.strip()
-                                    if text:
-                                        current_section["content"].append(f"• {text}")
-                                        logger.debug(f"Added list item: {text[:50]}...")
+                    while current_element:
+                        # Look the name up once; text nodes have no tag name
+                        name = getattr(current_element, 'name', None)
+                        if name in HEADING_TAG_NAMES:
+                            break
+                        if name == 'p':
+                            text = current_element.text.strip()
+                            if text:
+                                current_section["content"].append(text)
+                                logger.debug("Added paragraph: %.50s...", text)
+                        elif name == 'ul':
+                            # Build the list's bullets in one comprehension and add them together
+                            item_texts = (li.text.strip() for li in current_element.find_all('li', recursive=False))
+                            list_items = [f"• {text}" for text in item_texts if text]
+                            current_section["content"].extend(list_items)
+                            logger.debug("Added %d list items", len(list_items))
                         
                         current_element = current_element.next_sibling
                     
                     # Only add sections with content
                     if current_section["content"]:
                         sections.append(current_section)
-                        logger.debug(f"Added section '{current_section['name']}' with {len(current_section['content'])} items")
+                        logger.debug("Added section '%s' with %d items", current_section['name'], len(current_section['content']))
             
             # If no structured content found, fall back to flat extraction
             if not sections:
                 logger.info("No structured content found, using flat extraction")
                 all_paragraphs = []
+                nested_blocks = self._find_containers(main_content, ('p', 'div'))
                 for p in main_content.find_all(['p', 'div'], recursive=True):
-                    if p.name == 'div' and p.find(['p', 'div']):
+                    if p.name == 'div' and id(p) in nested_blocks:
                         continue  # Skip divs with nested paragraphs
                     
                     text = p.text.strip()
                     if text and len(text) > 20:  # Only include substantial paragraphs
                         all_paragraphs.append(text)
-                        logger.debug(f"Added text: {text[:50]}...")
+                        logger.debug("Added text: %.50s...", text)
                 
                 # If we have content, create a single section
                 if all_paragraphs:
@@ -654,15 +729,54 @@ class WebScraper:
         
         return sections if sections else None
     
+    def _measure_elements(self, soup: BeautifulSoup) -> Dict[int, List[int]]:
+        """
+        Measure the text length and the number of descendant headings and paragraphs of every element.
+        Returns a dict mapping id(element) to [text_length, structure_tag_count]
+        """
+        measures = {id(soup): [0, 0]}
+        elements = []
+        
+        # Descendants come in document order, so every parent is registered before its children
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                measures[id(node)] = [0, 0]
+                elements.append(node)
+            elif type(node) in TEXT_STRING_TYPES:
+                measures[id(node.parent)][0] += len(node)
+        
+        # Add each element's totals to its parent, children first
+        for element in reversed(elements):
+            measure = measures[id(element)]
+            parent_measure = measures[id(element.parent)]
+            parent_measure[0] += measure[0]
+            parent_measure[1] += measure[1] + (element.name in STRUCTURE_TAG_NAMES)
+        
+        return measures
+    
+    def _find_containers(self, root: Tag, names: Tuple[str, ...]) -> Set[int]:
+        """
+        Find the elements under root that have a descendant with one of the given tag names.
+        Returns a set with the id() of each such element
+        """
+        containers = set()
+        # In reverse document order every element comes after all of its descendants,
+        # so one pass marks each ancestor of a matching element without searching subtrees
+        for element in reversed(root.find_all(True)):
+            if element.name in names or id(element) in containers:
+                containers.add(id(element.parent))
+        return containers
+    
     def _extract_basic_content(self, soup: BeautifulSoup) -> List[Dict]:
         """Extract basic content when other methods fail."""
         logger.debug("Starting basic content extraction")
         
         # Extract title
         title = ""
-        if soup.find('title'):
-            title = soup.find('title').text.strip()
-            logger.debug(f"Page title: {title}")
+        title_tag = soup.find('title')
+        if title_tag:
+            title = title_tag.text.strip()
+            logger.debug("Page title: %s", title)
         
         # Extract all paragraphs
         paragraphs = []
@@ -670,35 +784,37 @@ class WebScraper:
             text = p.text.strip()
             if text and len(text) > 20:  # Only include substantial paragraphs
                 paragraphs.append(text)
-                logger.debug(f"Found paragraph: {text[:50]}...")
+                logger.debug("Found paragraph: %.50s...", text)
         
         logger.info(f"Found {len(paragraphs)} paragraphs in basic extraction")
         
         # If no paragraphs found, try getting text from divs
         if not paragraphs:
             logger.info("No paragraphs found, trying divs")
+            nested_divs = self._find_containers(soup, ('div',))
             for div in soup.find_all('div'):
                 # Skip divs that contain other divs to avoid duplication
-                if div.find('div'):
+                if id(div) in nested_divs:
                     continue
                     
                 text = div.text.strip()
                 if text and len(text) > 20:
                     paragraphs.append(text)
-                    logger.debug(f"Found div text: {text[:50]}...")
+                    logger.debug("Found div text: %.50s...", text)
         
         # Try table cells as a last resort
         if not paragraphs:
             logger.info("No paragraphs or divs found, trying table cells")
+            nested_cells = self._find_containers(soup, ('div', 'p', 'td'))
             for td in soup.find_all('td'):
                 # Skip cells with nested structure
-                if td.find(['div', 'p', 'td']):
+                if id(td) in nested_cells:
                     continue
                     
                 text = td.text.strip()
                 if text and len(text) > 20:
                     paragraphs.append(text)
-                    logger.debug(f"Found table cell text: {text[:50]}...")
+                    logger.debug("Found table cell text: %.50s...", text)
         
         # Create a basic section structure
         sections = [{